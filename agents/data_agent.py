@@ -15,21 +15,26 @@ This agent:
 It does NOT summarize or interpret data.
 """
 
-import yaml
-from typing import Dict, Any, List
-from storage.duckdb_loader import run_query
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple
+import pandas as pd
+from storage.duckdb_loader import run_query_df
+from schema.loader import get_schema, get_schema_index
+from agents.router import RoutedIntent
 
 
 # -----------------------------
 # Load schema registry
 # -----------------------------
 
-def load_schema_registry(path: str = "schema/registry.yaml") -> dict:
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+SCHEMA = get_schema()
 
+_SCHEMA_INDEX = get_schema_index()
+AVAILABLE_COLUMNS = _SCHEMA_INDEX["available_columns"]
+DIM_INDEX = _SCHEMA_INDEX["dimension_index"]
 
-SCHEMA = load_schema_registry()
+
+ROLLUPS = SCHEMA.get("rollups", {})
 
 
 # -----------------------------
@@ -48,10 +53,9 @@ METRIC_SQL_MAP = {
 # -----------------------------
 
 def validate_columns(table: str, columns: List[str]):
-    available = SCHEMA["tables"][table]["columns"].keys()
-    for col in columns:
-        if col not in available:
-            raise ValueError(f"Column '{col}' not found in table '{table}'")
+    missing = set(columns) - AVAILABLE_COLUMNS[table]
+    if missing:
+        raise ValueError(f"Columns not found in '{table}': {sorted(missing)}")
 
 
 def validate_metrics(metrics: List[str]):
@@ -64,11 +68,8 @@ def resolve_dimension_column(dim: str, tables: list) -> str:
     """
     Resolve which table a dimension belongs to.
     """
-    dimension_tables = [t for t in tables if t.startswith("dim_")]
-    fact_tables = [t for t in tables if t.startswith("fact_")]
-
-    for table in dimension_tables + fact_tables:
-        if dim in SCHEMA["tables"][table]["columns"]:
+    for table in DIM_INDEX.get(dim, ()):
+        if table in tables:
             return f"{table}.{dim}"
 
     raise ValueError(f"Unable to resolve dimension column: {dim}")
@@ -78,16 +79,16 @@ def resolve_dimension_column(dim: str, tables: list) -> str:
 # SQL builders
 # -----------------------------
 
-def build_select_clause(intent: Dict[str, Any]) -> List[str]:
+def build_select_clause(intent: RoutedIntent) -> List[str]:
     select_parts = []
 
     # ---- dimensions ----
-    for dim in intent.get("dimensions", []):
-        qualified_dim = resolve_dimension_column(dim, intent["resolved_tables"])
+    for dim in intent.dimensions:
+        qualified_dim = resolve_dimension_column(dim, intent.resolved_tables)
         select_parts.append(f"{qualified_dim} AS {dim}")
 
     # ---- metrics (STRICT) ----
-    for metric in intent.get("metrics", []):
+    for metric in intent.metrics:
         metric_sql = METRIC_SQL_MAP.get(metric)
         if not metric_sql:
             raise ValueError(f"Unsupported or unsafe metric: {metric}")
@@ -96,22 +97,127 @@ def build_select_clause(intent: Dict[str, Any]) -> List[str]:
     return select_parts
 
 
-def build_where_clause(filters: Dict[str, Any]) -> str:
-    if not filters:
-        return ""
+def coerce_filter_value(table: str, col: str, value: Any) -> Any:
+    """
+    Convert a filter value to the column's registry type, so DuckDB
+    compares typed values and can push the predicate into the
+    parquet scan instead of casting every row to text.
+    """
+    col_type = SCHEMA["tables"][table]["columns"][col]["type"]
+
+    try:
+        if col_type == "integer":
+            return int(value)
+        if col_type == "float":
+            return float(value)
+        if col_type == "date":
+            return date.fromisoformat(str(value)[:10])
+        if col_type == "boolean":
+            if isinstance(value, str):
+                return {"true": True, "false": False}[value.strip().lower()]
+            return bool(value)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(
+            f"Filter value {value!r} is not a valid {col_type} for column '{col}'"
+        ) from e
+
+    return str(value)
+
+
+def resolve_filter_table(col: str, tables: list) -> str:
+    """
+    Resolve which table a filter column belongs to.
+    The primary (fact) table wins so predicates stay next to its scan.
+    """
+    if col in AVAILABLE_COLUMNS[tables[0]]:
+        return tables[0]
+
+    for table in DIM_INDEX.get(col, ()):
+        if table in tables:
+            return table
+
+    raise ValueError(f"Unable to resolve filter column: {col}")
+
+
+def build_filter_conditions(filters: Dict[str, Any],
+                            tables: list) -> Dict[str, Tuple[List[str], List[Any]]]:
+    """
+    Build typed, parameterized predicates grouped by owning table.
+
+    Returns {table: (conditions, params)}; conditions use '?'
+    placeholders and params holds the bound values in order.
+    """
+    grouped: Dict[str, Tuple[List[str], List[Any]]] = {}
 
-    conditions = []
+    for col, values in (filters or {}).items():
+        table = resolve_filter_table(col, tables)
+        conditions, params = grouped.setdefault(table, ([], []))
 
-    for col, values in filters.items():
         if isinstance(values, list):
-            vals = ", ".join([f"'{v}'" for v in values])
-            conditions.append(f"{col} IN ({vals})")
+            placeholders = ", ".join("?" * len(values))
+            conditions.append(f"{table}.{col} IN ({placeholders})")
+            params.extend(coerce_filter_value(table, col, v) for v in values)
         else:
-            conditions.append(f"{col} = '{values}'")
+            conditions.append(f"{table}.{col} = ?")
+            params.append(coerce_filter_value(table, col, values))
+
+    return grouped
+
+
+def build_where_clause(conditions: List[str]) -> str:
+    if not conditions:
+        return ""
 
     return "WHERE " + " AND ".join(conditions)
 
 
+def build_fact_projection(intent: RoutedIntent, table: str) -> List[str]:
+    """
+    Columns of `table` the outer query needs: its dimensions,
+    metric base columns and the join key.
+    """
+    tables = intent.resolved_tables
+    columns = {"sku"}
+
+    for dim in intent.dimensions:
+        if resolve_dimension_column(dim, tables) == f"{table}.{dim}":
+            columns.add(dim)
+
+    for metric in intent.metrics:
+        base_column = SCHEMA["metrics"][metric].get("base_column")
+        if base_column:
+            columns.add(base_column)
+
+    return sorted(columns & AVAILABLE_COLUMNS[table])
+
+
+def select_rollup(intent: RoutedIntent) -> Optional[str]:
+    """
+    Return a registry rollup that can answer the intent, or None.
+
+    A rollup qualifies when the query reads only its source table and
+    every dimension, filter column and metric is one it keeps; summing
+    its pre-summed metrics then gives the same totals as the fact table.
+    Freshness is the storage layer's concern: run_query_df reads the
+    source instead while the rollup is stale.
+    """
+    if intent.required_joins:
+        return None
+
+    primary_table = intent.resolved_tables[0]
+    columns = set(intent.dimensions) | set(intent.filters or {})
+
+    for name, spec in ROLLUPS.items():
+        if (
+            spec["source"] == primary_table
+            and columns <= set(spec["dimensions"])
+            and set(intent.metrics) <= set(spec["metrics"])
+        ):
+            return name
+
+    return None
+
+
 def build_group_by_clause(dimensions: List[str], tables: list) -> str:
     if not dimensions:
         return ""
@@ -128,7 +234,7 @@ def build_group_by_clause(dimensions: List[str], tables: list) -> str:
 # Core execution function
 # -----------------------------
 
-def execute_intent(routed_intent: Dict[str, Any]) -> Dict[str, Any]:
+def execute_intent(routed_intent: RoutedIntent) -> Dict[str, Any]:
     """
     Build and execute SQL from routed intent.
 
@@ -136,18 +242,30 @@ def execute_intent(routed_intent: Dict[str, Any]) -> Dict[str, Any]:
     {
         result: DataFrame,
         sql: str,
+        params: list,
         row_count: int,
         columns: list
     }
-    """
 
-    if routed_intent.get("out_of_scope") or routed_intent.get("status") == "blocked":
-        raise ValueError("Data agent invoked for blocked or out-of-scope intent")
+    Blocked or out-of-scope intents return an empty result
+    with status "skipped".
+    """
 
-    tables = routed_intent["resolved_tables"]
-    dimensions = routed_intent.get("dimensions", [])
-    metrics = routed_intent.get("metrics", [])
-    filters = routed_intent.get("filters", {})
+    # ---- short-circuit: no validation, SQL build or query ----
+    if routed_intent.out_of_scope or routed_intent.status == "blocked":
+        return {
+            "result": pd.DataFrame(),
+            "sql": "",
+            "params": [],
+            "row_count": 0,
+            "columns": [],
+            "status": "skipped"
+        }
+
+    tables = routed_intent.resolved_tables
+    dimensions = routed_intent.dimensions
+    metrics = routed_intent.metrics
+    filters = routed_intent.filters
 
     primary_table = tables[0]
 
@@ -157,41 +275,65 @@ def execute_intent(routed_intent: Dict[str, Any]) -> Dict[str, Any]:
 
     # ---- SELECT ----
     select_clause = build_select_clause(routed_intent)
-    select_sql = "SELECT " + ", ".join(select_clause)
+    parts = ["SELECT " + ", ".join(select_clause)]
+
+    # ---- typed filters, grouped by table ----
+    grouped_filters = build_filter_conditions(filters, tables)
+    primary_conditions, params = grouped_filters.pop(primary_table, ([], []))
+
+    outer_conditions: List[str] = []
+    for conditions, table_params in grouped_filters.values():
+        outer_conditions.extend(conditions)
+        params = params + table_params
+
+    joins = routed_intent.required_joins
 
     # ---- FROM + JOINS ----
-    from_sql = f"FROM {primary_table}"
+    if joins and primary_conditions:
+        # filter and project the fact table before the join so the
+        # predicates reach the parquet scan even if the optimizer
+        # would not push them through the join
+        fact_columns = ", ".join(build_fact_projection(routed_intent, primary_table))
+        parts.append(
+            f"FROM (SELECT {fact_columns} FROM {primary_table} "
+            f"{build_where_clause(primary_conditions)}) AS {primary_table}"
+        )
+    else:
+        # a rollup is aliased to its source, so the qualified column
+        # references built above resolve against it unchanged
+        rollup = select_rollup(routed_intent)
+        if rollup:
+            parts.append(f"FROM {rollup} AS {primary_table}")
+        else:
+            parts.append(f"FROM {primary_table}")
+        outer_conditions = primary_conditions + outer_conditions
 
-    join_sql_parts = []
-    for join in routed_intent.get("required_joins", []):
-        join_sql_parts.append(
+    for join in joins:
+        parts.append(
             f"{join['type'].upper()} JOIN {join['right']} "
             f"ON {join['left']}.sku = {join['right']}.sku"
         )
 
-    join_sql = " ".join(join_sql_parts)
-
     # ---- WHERE ----
-    where_sql = build_where_clause(filters)
+    where_sql = build_where_clause(outer_conditions)
+    if where_sql:
+        parts.append(where_sql)
 
     # ---- GROUP BY ----
     group_by_sql = build_group_by_clause(dimensions, tables)
+    if group_by_sql:
+        parts.append(group_by_sql)
 
     # ---- Final SQL ----
-    sql = f"""
-    {select_sql}
-    {from_sql}
-    {join_sql}
-    {where_sql}
-    {group_by_sql}
-    """
+    sql = "\n".join(parts)
 
     # ---- execute ----
-    df = run_query(sql)
+    df = run_query_df(sql, params)
 
     return {
         "result": df,
         "sql": sql,
+        "params": params,
         "row_count": len(df),
         "columns": list(df.columns)
     }
@@ -203,17 +345,13 @@ def execute_intent(routed_intent: Dict[str, Any]) -> Dict[str, Any]:
 
 if __name__ == "__main__":
 
-    test_routed_intent = {
-        "question_type": "ranking",
-        "business_question": "Which category has highest revenue?",
-        "resolved_tables": ["fact_sales"],
-        "required_joins": [],
-        "metrics": ["revenue", "orders"],
-        "dimensions": ["category"],
-        "filters": {},
-        "execution_mode": "qa",
-        "query_complexity": "light"
-    }
+    test_routed_intent = RoutedIntent(
+        question_type="ranking",
+        business_question="Which category has highest revenue?",
+        resolved_tables=("fact_sales",),
+        metrics=("revenue", "orders"),
+        dimensions=("category",)
+    )
 
     output = execute_intent(test_routed_intent)
 
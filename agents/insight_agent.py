@@ -15,22 +15,33 @@ It NEVER queries data.
 It NEVER modifies numbers.
 """
 
-import yaml
 import json
 from typing import Dict, Any
 import pandas as pd
+from schema.loader import get_business_rules
+
+# orjson is optional; compact stdlib json is the fallback
+try:
+    import orjson
+
+    def to_compact_json(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY, default=str).decode()
+
+except ImportError:
+
+    def _json_default(obj: Any) -> Any:
+        # numpy scalars expose .item(); anything else is stringified
+        return obj.item() if hasattr(obj, "item") else str(obj)
+
+    def to_compact_json(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), default=_json_default)
 
 
 # -----------------------------
 # Load business rules
 # -----------------------------
 
-def load_business_rules(path: str = "schema/business_rules.yaml") -> dict:
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
-
-
-BUSINESS_RULES = load_business_rules()
+BUSINESS_RULES = get_business_rules()
 
 
 # -----------------------------
@@ -43,9 +54,12 @@ def build_insight_prompt(intent: Dict[str, Any],
                          business_rules: dict) -> str:
     """
     Build a tightly constrained insight-generation prompt.
+
+    Payloads are serialized as compact JSON (no indentation) to
+    keep the prompt, and therefore LLM latency, small.
     """
 
-    sample_rows = df.head(10).to_dict(orient="records")
+    sample_rows = df.head(10).to_json(orient="records", date_format="iso")
 
     return f"""
 You are a senior retail business analyst.
@@ -61,16 +75,16 @@ Rules:
 - Prefer bullet points.
 
 User intent:
-{json.dumps(intent, indent=2)}
+{to_compact_json(intent)}
 
 Validation status:
-{json.dumps(validation, indent=2)}
+{to_compact_json(validation)}
 
 Business rules:
-{json.dumps(business_rules["executive_summary"], indent=2)}
+{to_compact_json(business_rules["executive_summary"])}
 
 Sample result rows:
-{json.dumps(sample_rows, indent=2)}
+{sample_rows}
 
 Write the final business insight.
 """
@@ -88,13 +102,32 @@ def generate_insight(intent: Dict[str, Any],
     Generate business insights using validated data.
     """
 
-    df = data_output["result"]
-
-    prompt = build_insight_prompt(intent, validation, df, BUSINESS_RULES)
+    prompt = build_insight_prompt(intent, validation, data_output["result"], BUSINESS_RULES)
 
-    # ---- LLM call (replace with real client later) ----
     insight_text = llm_client.generate(prompt)
 
+    return build_insight_output(insight_text, intent, data_output, validation)
+
+
+async def agenerate_insight(intent: Dict[str, Any],
+                            data_output: Dict[str, Any],
+                            validation: Dict[str, Any],
+                            llm_client) -> Dict[str, Any]:
+    """
+    Async variant of generate_insight; awaits the LLM call.
+    """
+
+    prompt = build_insight_prompt(intent, validation, data_output["result"], BUSINESS_RULES)
+
+    insight_text = await llm_client.agenerate(prompt)
+
+    return build_insight_output(insight_text, intent, data_output, validation)
+
+
+def build_insight_output(insight_text: str,
+                         intent: Dict[str, Any],
+                         data_output: Dict[str, Any],
+                         validation: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "insight": insight_text,
         "row_count": data_output["row_count"],
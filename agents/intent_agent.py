@@ -15,20 +15,17 @@ It does NOT touch data.
 """
 
 import json
-import yaml
-from typing import Dict, Any
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from schema.loader import get_schema
 
 
 # -----------------------------
 # Load schema registry
 # -----------------------------
 
-def load_schema_registry(path: str = "schema/registry.yaml") -> dict:
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
-
-
-SCHEMA = load_schema_registry()
+SCHEMA = get_schema()
 
 
 # -----------------------------
@@ -66,7 +63,11 @@ INTENT_TEMPLATE = {
 # Prompt builder (STRICT)
 # -----------------------------
 
-def build_intent_prompt(user_query: str, schema: dict) -> str:
+def build_intent_prompt_prefix(schema: dict) -> str:
+    """
+    Everything in the intent prompt except the user question.
+    Depends only on the schema, so it is built once at import.
+    """
     return f"""
 You are a STRICT analytics intent extraction engine.
 
@@ -100,10 +101,60 @@ Supported question types:
 JSON STRUCTURE (must match exactly):
 
 {json.dumps(INTENT_TEMPLATE, indent=2)}
+"""
+
 
+_INTENT_PROMPT_PREFIX = build_intent_prompt_prefix(SCHEMA)
+
+
+def build_intent_prompt(user_query: str) -> str:
+    return _INTENT_PROMPT_PREFIX + f'''
 User question:
-\"\"\"{user_query}\"\"\"
-"""
+"""{user_query}"""
+'''
+
+
+# -----------------------------
+# Intent response cache
+# -----------------------------
+# The intent JSON depends only on the question (the prompt prefix is
+# fixed per process), so raw LLM responses are kept in an LRU keyed
+# by normalized question and model. Hits skip the LLM call; the text
+# is re-parsed so every caller gets its own intent dict.
+
+INTENT_CACHE_SIZE = 1024
+
+_intent_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_intent_cache_lock = threading.Lock()
+
+
+def normalize_query(user_query: str) -> str:
+    return " ".join(user_query.split()).lower()
+
+
+def _cache_key(user_query: str, llm_client) -> Tuple[str, str]:
+    return normalize_query(user_query), getattr(llm_client, "model", "")
+
+
+def _cache_get(key: Tuple[str, str]) -> Optional[str]:
+    with _intent_cache_lock:
+        response_text = _intent_cache.get(key)
+        if response_text is not None:
+            _intent_cache.move_to_end(key)
+        return response_text
+
+
+def _cache_put(key: Tuple[str, str], response_text: str):
+    with _intent_cache_lock:
+        _intent_cache[key] = response_text
+        _intent_cache.move_to_end(key)
+        if len(_intent_cache) > INTENT_CACHE_SIZE:
+            _intent_cache.popitem(last=False)
+
+
+def clear_intent_cache():
+    with _intent_cache_lock:
+        _intent_cache.clear()
 
 
 # -----------------------------
@@ -115,9 +166,42 @@ def resolve_intent(user_query: str, llm_client) -> Dict[str, Any]:
     Convert user query into structured analytics intent.
     """
 
-    prompt = build_intent_prompt(user_query, SCHEMA)
+    key = _cache_key(user_query, llm_client)
+    cached = _cache_get(key)
+
+    if cached is not None:
+        return parse_intent_response(user_query, cached)
+
+    response_text = llm_client.generate(build_intent_prompt(user_query))
+    intent = parse_intent_response(user_query, response_text)
+
+    # cache only responses that parsed
+    _cache_put(key, response_text)
+    return intent
+
+
+async def aresolve_intent(user_query: str, llm_client) -> Dict[str, Any]:
+    """
+    Async variant of resolve_intent; awaits the LLM call.
+    """
+
+    key = _cache_key(user_query, llm_client)
+    cached = _cache_get(key)
+
+    if cached is not None:
+        return parse_intent_response(user_query, cached)
+
+    response_text = await llm_client.agenerate(build_intent_prompt(user_query))
+    intent = parse_intent_response(user_query, response_text)
 
-    response_text = llm_client.generate(prompt)
+    _cache_put(key, response_text)
+    return intent
+
+
+def parse_intent_response(user_query: str, response_text: str) -> Dict[str, Any]:
+    """
+    Parse and safety-check the raw LLM response into an intent.
+    """
 
     # -----------------------------
     # Strict JSON extraction
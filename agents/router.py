@@ -13,58 +13,79 @@ This agent:
 - enforces schema and business constraints
 
 It does NOT generate SQL.
+
+The routed plan is returned as a frozen RoutedIntent, so downstream
+agents read typed attributes instead of re-probing a dict.
 """
 
-import yaml
-from typing import Dict, Any, List
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple
+from schema.loader import get_schema
 
 
 # -----------------------------
 # Load schema registry
 # -----------------------------
 
-def load_schema_registry(path: str = "schema/registry.yaml") -> dict:
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+SCHEMA = get_schema()
+
+AVAILABLE_TABLES = frozenset(SCHEMA["tables"])
+
 
+# -----------------------------
+# Routed intent
+# -----------------------------
 
-SCHEMA = load_schema_registry()
+@dataclass(frozen=True, slots=True)
+class RoutedIntent:
+    """Immutable query plan handed to the data and validation agents."""
+
+    question_type: str
+    resolved_tables: Tuple[str, ...]
+    business_question: str = ""
+    dimensions: Tuple[str, ...] = ()
+    metrics: Tuple[str, ...] = ()
+    filters: Dict[str, Any] = field(default_factory=dict)
+    time_range: Dict[str, Any] = field(default_factory=dict)
+    required_joins: Tuple[Dict[str, Any], ...] = ()
+    execution_mode: str = "qa"
+    query_complexity: str = "light"
+    safety_status: str = "pass"
+    out_of_scope: bool = False
+    status: Optional[str] = None
 
 
 # -----------------------------
 # Router core
 # -----------------------------
 
-def route_intent(intent: Dict[str, Any]) -> Dict[str, Any]:
+def route_intent(intent: Dict[str, Any]) -> RoutedIntent:
     """
     Enrich intent with routing and execution plan.
 
-    Returns updated intent with:
+    Returns a RoutedIntent with:
     - resolved_tables
     - required_joins
     - query_complexity
     - execution_mode
     """
 
-    routed_intent = intent.copy()
-
     # -----------------------------
     # 1. Validate target tables
     # -----------------------------
 
-    available_tables = SCHEMA["tables"].keys()
+    requested_tables = intent.get("target_tables", [])
 
-    resolved_tables = []
-    for table in intent.get("target_tables", []):
-        if table not in available_tables:
-            raise ValueError(f"Unknown table requested: {table}")
-        resolved_tables.append(table)
+    unknown_tables = set(requested_tables) - AVAILABLE_TABLES
+    if unknown_tables:
+        raise ValueError(f"Unknown tables requested: {sorted(unknown_tables)}")
 
-    if not resolved_tables:
-        # default to fact_sales if not specified
-        resolved_tables = ["fact_sales"]
+    # default to fact_sales if not specified
+    resolved_tables = tuple(requested_tables) or ("fact_sales",)
 
-    routed_intent["resolved_tables"] = resolved_tables
+    metrics = tuple(intent.get("metrics") or ())
+    dimensions = tuple(intent.get("dimensions") or ())
+    time_range = intent.get("time_range") or {}
 
 
     # -----------------------------
@@ -81,8 +102,6 @@ def route_intent(intent: Dict[str, Any]) -> Dict[str, Any]:
             "type": "left"
         })
 
-    routed_intent["required_joins"] = required_joins
-
 
     # -----------------------------
     # 3. Determine execution mode
@@ -93,8 +112,6 @@ def route_intent(intent: Dict[str, Any]) -> Dict[str, Any]:
     else:
         execution_mode = "qa"
 
-    routed_intent["execution_mode"] = execution_mode
-
 
     # -----------------------------
     # 4. Estimate query complexity
@@ -102,11 +119,11 @@ def route_intent(intent: Dict[str, Any]) -> Dict[str, Any]:
 
     complexity_score = 0
 
-    complexity_score += len(routed_intent.get("metrics", []))
-    complexity_score += len(routed_intent.get("dimensions", []))
+    complexity_score += len(metrics)
+    complexity_score += len(dimensions)
     complexity_score += len(required_joins) * 2
 
-    if intent.get("time_range", {}).get("comparison"):
+    if time_range.get("comparison"):
         complexity_score += 2
 
     if complexity_score <= 3:
@@ -116,8 +133,6 @@ def route_intent(intent: Dict[str, Any]) -> Dict[str, Any]:
     else:
         query_complexity = "heavy"
 
-    routed_intent["query_complexity"] = query_complexity
-
 
     # -----------------------------
     # 5. Enforce safety limits
@@ -125,15 +140,31 @@ def route_intent(intent: Dict[str, Any]) -> Dict[str, Any]:
 
     max_dims = SCHEMA["business_rules"]["safety_limits"]["max_groupby_columns"]
 
-    if len(intent.get("dimensions", [])) > max_dims:
+    if len(dimensions) > max_dims:
         raise ValueError(
             f"Too many group by dimensions requested. Max allowed: {max_dims}"
         )
 
-    routed_intent["safety_status"] = "pass"
 
+    # -----------------------------
+    # Routed intent
+    # -----------------------------
 
-    return routed_intent
+    return RoutedIntent(
+        question_type=intent["question_type"],
+        business_question=intent.get("business_question", ""),
+        resolved_tables=resolved_tables,
+        dimensions=dimensions,
+        metrics=metrics,
+        filters=intent.get("filters") or {},
+        time_range=time_range,
+        required_joins=tuple(required_joins),
+        execution_mode=execution_mode,
+        query_complexity=query_complexity,
+        safety_status="pass",
+        out_of_scope=bool(intent.get("out_of_scope")),
+        status=intent.get("status")
+    )
 
 
 # -----------------------------
@@ -164,5 +195,5 @@ if __name__ == "__main__":
 
     routed = route_intent(test_intent)
     print("\nROUTED INTENT:\n")
-    for k, v in routed.items():
-        print(f"{k}: {v}")
+    for k in RoutedIntent.__slots__:
+        print(f"{k}: {getattr(routed, k)}")
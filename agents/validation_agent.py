@@ -15,22 +15,18 @@ This agent:
 It NEVER generates insights.
 """
 
-import yaml
 import pandas as pd
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from schema.loader import get_business_rules
+from agents.router import RoutedIntent
 
 
 # -----------------------------
 # Load business rules
 # -----------------------------
 
-def load_business_rules(path: str = "schema/business_rules.yaml") -> dict:
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
-
-
-BUSINESS_RULES = load_business_rules()
+BUSINESS_RULES = get_business_rules()
 
 
 # -----------------------------
@@ -43,40 +39,74 @@ FORBIDDEN_SUM_COLUMNS = [
     "sales_channel", "currency"
 ]
 
+_FORBIDDEN_SUM_RE = re.compile(
+    r"sum\s*\(\s*(" + "|".join(map(re.escape, FORBIDDEN_SUM_COLUMNS)) + r")\s*\)",
+    re.IGNORECASE
+)
+
+_DESTRUCTIVE_RE = re.compile(
+    r";--|drop table|delete from|truncate table",
+    re.IGNORECASE
+)
+
+_WILDCARD_SELECT_RE = re.compile(r"select\s+\*", re.IGNORECASE)
+_JOIN_RE = re.compile(r"\sjoin\s", re.IGNORECASE)
+_ON_RE = re.compile(r"\son\s", re.IGNORECASE)
+
 
 def validate_sql(sql: str):
     """
     Block analytics-unsafe SQL before execution.
     """
 
-    sql_lower = sql.lower()
-
     # ---- block SUM on non-numeric columns ----
-    for col in FORBIDDEN_SUM_COLUMNS:
-        pattern = rf"sum\s*\(\s*{col}\s*\)"
-        if re.search(pattern, sql_lower):
-            raise ValueError(f"Unsafe aggregation detected: SUM({col}) is not allowed")
+    match = _FORBIDDEN_SUM_RE.search(sql)
+    if match:
+        col = match.group(1).lower()
+        raise ValueError(f"Unsafe aggregation detected: SUM({col}) is not allowed")
 
     # ---- block SELECT * ----
-    if "select *" in sql_lower:
+    if _WILDCARD_SELECT_RE.search(sql):
         raise ValueError("Wildcard SELECT is not allowed in analytics queries")
 
     # ---- block cartesian products ----
-    if " join " in sql_lower and " on " not in sql_lower:
+    if _JOIN_RE.search(sql) and not _ON_RE.search(sql):
         raise ValueError("JOIN without ON clause detected")
 
     # ---- basic SQL injection / corruption patterns ----
-    forbidden_tokens = [";--", "drop table", "delete from", "truncate table"]
-    for token in forbidden_tokens:
-        if token in sql_lower:
-            raise ValueError("Potentially destructive SQL detected")
+    if _DESTRUCTIVE_RE.search(sql):
+        raise ValueError("Potentially destructive SQL detected")
+
+
+# -----------------------------
+# Result helpers
+# -----------------------------
+
+def unknown_mask(col: pd.Series, nulls: Optional[pd.Series] = None) -> pd.Series:
+    """
+    Flag null or 'unknown' (any casing) values.
+
+    Categorical columns are checked once over their categories
+    instead of over every row. Pass a precomputed null mask to
+    avoid recomputing it.
+    """
+    if nulls is None:
+        nulls = col.isna()
+
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        unknown_cats = col.cat.categories[
+            col.cat.categories.astype("string").str.casefold() == "unknown"
+        ]
+        return nulls | col.isin(unknown_cats)
+
+    return nulls | col.astype("string").str.casefold().eq("unknown").fillna(False)
 
 
 # -----------------------------
 # Core result validation logic
 # -----------------------------
 
-def validate_result(routed_intent: Dict[str, Any], data_output: Dict[str, Any]) -> Dict[str, Any]:
+def validate_result(routed_intent: RoutedIntent, data_output: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate query result against business and sanity rules.
 
@@ -105,7 +135,28 @@ def validate_result(routed_intent: Dict[str, Any], data_output: Dict[str, Any])
             "row_count": 0
         }
 
-    null_ratio = df.isna().mean().mean()
+    # -----------------------------
+    # Single pass over the result
+    # -----------------------------
+    # All reductions the checks below need are computed here once:
+    # the null mask, and one df.agg() for metric min/max/sum.
+
+    null_mask = df.isna()
+
+    # only growth / cancellation columns carry sanity limits
+    checked_cols = [
+        col for col in df.select_dtypes(include="number").columns
+        if "growth" in col.lower() or "cancellation" in col.lower()
+    ]
+
+    agg_spec = {col: ["min", "max"] for col in checked_cols}
+    if "total_revenue" in df.columns:
+        agg_spec.setdefault("total_revenue", []).append("sum")
+
+    stats = df.agg(agg_spec) if agg_spec else None
+
+    # single reduction over the null mask (same value as the mean of column means)
+    null_ratio = null_mask.to_numpy().mean()
     if null_ratio > 0.5:
         issues.append("Result contains more than 50% null values")
         status = "warn"
@@ -126,10 +177,10 @@ def validate_result(routed_intent: Dict[str, Any], data_output: Dict[str, Any])
 
     sanity_limits = BUSINESS_RULES["validation"]["sanity_limits"]
 
-    for col in df.select_dtypes(include="number").columns:
+    for col in checked_cols:
 
-        min_val = df[col].min()
-        max_val = df[col].max()
+        min_val = stats.at["min", col]
+        max_val = stats.at["max", col]
 
         if "growth" in col.lower():
             if min_val < sanity_limits["revenue_growth_min"] or max_val > sanity_limits["revenue_growth_max"]:
@@ -145,13 +196,13 @@ def validate_result(routed_intent: Dict[str, Any], data_output: Dict[str, Any])
     # 4. Intent-result consistency
     # -----------------------------
 
-    expected_dims = routed_intent.get("dimensions", [])
+    expected_dims = routed_intent.dimensions
     for dim in expected_dims:
         if dim not in df.columns:
             issues.append(f"Expected dimension missing from result: {dim}")
             status = "block"
 
-    expected_metrics = routed_intent.get("metrics", [])
+    expected_metrics = routed_intent.metrics
 
     # Metric outputs are renamed in Data Agent (total_revenue, total_orders, etc.)
     metric_column_map = {
@@ -171,7 +222,7 @@ def validate_result(routed_intent: Dict[str, Any], data_output: Dict[str, Any])
     # -----------------------------
 
     if "total_revenue" in df.columns:
-        if df["total_revenue"].sum() <= 0:
+        if stats.at["sum", "total_revenue"] <= 0:
             issues.append("Total revenue is zero or negative")
             status = "warn"
 
@@ -180,10 +231,7 @@ def validate_result(routed_intent: Dict[str, Any], data_output: Dict[str, Any])
     # -----------------------------
 
     if "category" in df.columns:
-        unknown_ratio = (
-            df["category"].isna().sum() +
-            (df["category"].astype(str).str.lower() == "unknown").sum()
-        ) / len(df)
+        unknown_ratio = unknown_mask(df["category"], null_mask["category"]).mean()
 
         if unknown_ratio > 0.2:
             issues.append(
@@ -225,10 +273,12 @@ if __name__ == "__main__":
         "columns": ["category", "total_revenue", "total_orders"]
     }
 
-    fake_intent = {
-        "metrics": ["revenue", "orders"],
-        "dimensions": ["category"]
-    }
+    fake_intent = RoutedIntent(
+        question_type="ranking",
+        resolved_tables=("fact_sales",),
+        metrics=("revenue", "orders"),
+        dimensions=("category",)
+    )
 
     verdict = validate_result(fake_intent, fake_output)
     print("\nVALIDATION RESULT:\n", verdict)
@@ -6,7 +6,7 @@ ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT_DIR))
 
 import streamlit as st
-from orchestration.graph import build_graph
+from orchestration.graph import get_app, invoke_cached
 
 
 # -----------------------------
@@ -26,11 +26,8 @@ st.caption("Ask business questions and get validated insights from your data.")
 # Initialize system
 # -----------------------------
 
-@st.cache_resource
-def load_graph():
-    return build_graph()
-
-app = load_graph()
+# compiled once per process; Streamlit reruns reuse it
+app = get_app()
 
 # Session state for chat history
 if "chat_history" not in st.session_state:
@@ -54,7 +51,7 @@ submit = st.button("Run")
 if submit and user_query:
 
     with st.spinner("Analyzing..."):
-        result = app.invoke({"user_query": user_query})
+        result = invoke_cached(app, user_query)
 
     # Save conversation
     st.session_state.chat_history.append({
@@ -74,7 +71,7 @@ for turn in reversed(st.session_state.chat_history):
     result = turn["result"]
     
     # Out-of-scope handling
-    if result.get("status") == "blocked":
+    if result.get("status") in ("blocked", "skipped"):
         st.error(
             "❌ This question is outside the supported analytics domain.\n\n"
             "I can answer questions related to retail sales, revenue, trends, and performance."
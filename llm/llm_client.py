@@ -1,17 +1,64 @@
+import asyncio
+import atexit
 import os
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
 
 
+# One pooled sync and async HTTP client for every LLMClient, so calls
+# and concurrent sessions reuse keep-alive connections instead of
+# paying a TCP + TLS handshake each time.
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = 30
+
+HTTP_CLIENT = httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+ASYNC_HTTP_CLIENT = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+# a close scheduled on a running loop; kept so it is not collected
+# before it finishes
+_close_tasks = set()
+
+
+def close_http_clients():
+    """
+    Close the shared HTTP connection pools.
+
+    Every LLMClient uses them, so they are closed once, at process
+    exit, rather than by any one client.
+    """
+    HTTP_CLIENT.close()
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # the usual case at exit: no loop running, so give
+        # aclose() one of its own
+        asyncio.run(ASYNC_HTTP_CLIENT.aclose())
+    else:
+        task = loop.create_task(ASYNC_HTTP_CLIENT.aclose())
+        _close_tasks.add(task)
+        task.add_done_callback(_close_tasks.discard)
+
+
+atexit.register(close_http_clients)
+
+
 class LLMClient:
     def __init__(self, model="gpt-4o-mini", temperature=0):
+        self.model = model
         self.llm = ChatOpenAI(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("OPENAI_API_KEY")
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=HTTP_CLIENT,
+            http_async_client=ASYNC_HTTP_CLIENT
         )
         self.parser = StrOutputParser()
+        self.chain = self.llm | self.parser
 
     def generate(self, prompt: str) -> str:
-        chain = self.llm | self.parser
-        return chain.invoke(prompt)
+        return self.chain.invoke(prompt)
+
+    async def agenerate(self, prompt: str) -> str:
+        return await self.chain.ainvoke(prompt)
@@ -8,9 +8,7 @@ LangGraph orchestration for Retail Insights Assistant.
 Flow:
 User Query
    ↓
-Intent Agent
-   ↓
-Router Agent
+Intent Agent (+ deterministic routing)
    ↓
 Data Agent
    ↓
@@ -22,16 +20,30 @@ Insight Agent
 Final Output
 """
 
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 from orchestration.state import AgentState
 from orchestration.memory import IntentMemory
 
-from agents.intent_agent import resolve_intent
+from agents.intent_agent import (
+    resolve_intent, aresolve_intent, normalize_query, clear_intent_cache
+)
 from agents.router import route_intent
 from agents.data_agent import execute_intent
 from agents.validation_agent import validate_result
-from agents.insight_agent import generate_insight
+from agents.insight_agent import generate_insight, agenerate_insight
+from schema.loader import get_schema_version
+from storage.duckdb_loader import QUERY_CACHE_TTL, clear_query_cache
 
 
 # -----------------------------
@@ -40,6 +52,8 @@ from agents.insight_agent import generate_insight
 
 from llm.llm_client import LLMClient
 
+# one client serves every node, session and request; its shared HTTP
+# pools are closed at process exit by llm_client.py
 llm_client = LLMClient(model="gpt-4o-mini", temperature=0)
 
 
@@ -50,9 +64,21 @@ llm_client = LLMClient(model="gpt-4o-mini", temperature=0)
 
 memory = IntentMemory(max_history=5)
 
+# Nodes that call the LLM have sync and async variants, so the graph
+# runs under app.invoke and, without blocking the event loop, under
+# app.ainvoke (concurrent sessions overlap their LLM waits).
+
 def intent_node(state: AgentState) -> AgentState:
     raw_intent = resolve_intent(state["user_query"], llm_client)
+    return intent_update(raw_intent)
+
 
+async def aintent_node(state: AgentState) -> AgentState:
+    raw_intent = await aresolve_intent(state["user_query"], llm_client)
+    return intent_update(raw_intent)
+
+
+def intent_update(raw_intent: dict) -> AgentState:
     # Stop early if out of scope
     if raw_intent.get("out_of_scope"):
         return {
@@ -62,18 +88,23 @@ def intent_node(state: AgentState) -> AgentState:
         }
 
     resolved_intent = memory.resolve_followup(raw_intent)
-    return {"intent": resolved_intent}
-
-
 
-def router_node(state: AgentState) -> AgentState:
-    routed = route_intent(state["intent"])
-    return {"routed_intent": routed}
+    # routing is a pure schema lookup, so it runs here rather than
+    # as a separate graph hop
+    return {
+        "intent": resolved_intent,
+        "routed_intent": route_intent(resolved_intent)
+    }
 
 
 def data_node(state: AgentState) -> AgentState:
     try:
         output = execute_intent(state["routed_intent"])
+
+        # out-of-scope intent: nothing to validate or summarize
+        if output.get("status") == "skipped":
+            return {"data_output": output, "status": "skipped"}
+
         return {"data_output": output}
 
     except ValueError as e:
@@ -109,6 +140,21 @@ def insight_node(state: AgentState) -> AgentState:
         llm_client=llm_client
     )
 
+    return insight_update(insight)
+
+
+async def ainsight_node(state: AgentState) -> AgentState:
+    insight = await agenerate_insight(
+        intent=state["intent"],
+        data_output=state["data_output"],
+        validation=state["validation"],
+        llm_client=llm_client
+    )
+
+    return insight_update(insight)
+
+
+def insight_update(insight: dict) -> AgentState:
     return {
         "insight": insight,
         "status": "completed"
@@ -125,7 +171,7 @@ def validation_router(state: AgentState) -> str:
     return "insight"
 
 def data_router(state: AgentState) -> str:
-    if state.get("status") == "blocked":
+    if state.get("status") in ("blocked", "skipped"):
         return "end"
     return "validation"
 
@@ -133,7 +179,7 @@ def data_router(state: AgentState) -> str:
 def scope_router(state: AgentState) -> str:
     if state.get("status") == "blocked":
         return "end"
-    return "router"
+    return "data"
 
 # -----------------------------
 # Build LangGraph
@@ -143,27 +189,22 @@ def build_graph():
 
     graph = StateGraph(AgentState)
 
-    graph.add_node("intent", intent_node)
-    graph.add_node("router", router_node)
+    graph.add_node("intent", RunnableLambda(intent_node, afunc=aintent_node, name="intent"))
     graph.add_node("data", data_node)
     graph.add_node("validation", validation_node)
-    graph.add_node("insight", insight_node)
+    graph.add_node("insight", RunnableLambda(insight_node, afunc=ainsight_node, name="insight"))
 
     graph.set_entry_point("intent")
 
-    graph.add_edge("intent", "router")
-    
     graph.add_conditional_edges(
         "intent",
         scope_router,
         {
-            "router": "router",
+            "data": "data",
             "end": END
         }
     )
     
-    graph.add_edge("router", "data")
-    
     graph.add_conditional_edges(
         "validation",
         validation_router,
@@ -189,13 +230,125 @@ def build_graph():
     return graph.compile()
 
 
+@lru_cache(maxsize=1)
+def get_app():
+    """The compiled graph, built once per process and shared by callers."""
+    return build_graph()
+
+
+# -----------------------------
+# Cached execution
+# -----------------------------
+# A run is deterministic given the question, the schema version and
+# the analytical context held in memory, so completed results are
+# cached on exactly that key. Repeat questions skip both LLM calls and
+# SQL. Entries expire with the query result cache, so answers pick up
+# parquet rewrites; blocked or failed runs are never cached, so a
+# transient timeout does not stick to a question.
+
+RESULT_CACHE_SIZE = 256
+
+_result_cache: "OrderedDict[tuple, Tuple[float, AgentState]]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _result_cache_get(key: tuple) -> Optional[AgentState]:
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+
+        expires, result = entry
+        if expires < time.monotonic():
+            del _result_cache[key]
+            return None
+
+        _result_cache.move_to_end(key)
+        return result
+
+
+def _result_cache_put(key: tuple, result: AgentState):
+    with _result_cache_lock:
+        _result_cache[key] = (time.monotonic() + QUERY_CACHE_TTL, result)
+        _result_cache.move_to_end(key)
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def clear_result_cache():
+    with _result_cache_lock:
+        _result_cache.clear()
+
+
+def remember_result(result: AgentState):
+    """Apply the memory update a live run would have made."""
+    validation = result.get("validation")
+    if validation and validation["status"] != "block":
+        memory.store_intent(result["intent"])
+
+
+def invoke_cached(app, user_query: str) -> AgentState:
+    """Run the graph, reusing the result of an identical earlier run."""
+    context_key = json.dumps(memory.active_context, sort_keys=True, default=str)
+
+    # the normalized text only keys the cache; the run sees the question
+    # as the user wrote it
+    key = (normalize_query(user_query), get_schema_version(), context_key)
+
+    cached = _result_cache_get(key)
+    if cached is not None:
+        remember_result(cached)
+        return cached
+
+    result = app.invoke({"user_query": user_query})
+
+    if result.get("status") == "completed":
+        _result_cache_put(key, result)
+
+    return result
+
+
+# -----------------------------
+# Concurrent execution
+# -----------------------------
+# Batches of independent questions (e.g. offline evaluation) run
+# concurrently rather than one after another. Each run awaits its
+# LLM calls, so concurrent runs overlap their network waits. The
+# semaphore bounds in-flight runs (and therefore open LLM requests).
+# Runs share one memory, so use this for independent questions, not
+# ordered follow-ups.
+
+LLM_CONCURRENCY = int(os.getenv("RIA_LLM_CONCURRENCY", "8"))
+
+
+async def run_batch_async(app, queries: List[str],
+                          max_concurrency: int = LLM_CONCURRENCY) -> List[AgentState]:
+    """Run independent queries concurrently; results keep input order."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(query: str) -> AgentState:
+        async with semaphore:
+            return await app.ainvoke({"user_query": query})
+
+    return await asyncio.gather(*(run_one(q) for q in queries))
+
+
+def run_batch(app, queries: List[str],
+              max_concurrency: int = LLM_CONCURRENCY) -> List[AgentState]:
+    """Synchronous counterpart of run_batch_async, via app.batch."""
+    return app.batch(
+        [{"user_query": q} for q in queries],
+        config={"max_concurrency": max_concurrency}
+    )
+
+
 # -----------------------------
 # Local test runner
 # -----------------------------
 
 if __name__ == "__main__":
 
-    app = build_graph()
+    app = get_app()
 
     result = app.invoke({
         "user_query": "Which category generated the highest revenue last quarter?"
@@ -207,4 +360,7 @@ if __name__ == "__main__":
 #Restart memory after UI session ends
 
 def reset_memory():
-    memory.clear()
\ No newline at end of file
+    memory.clear()
+    clear_intent_cache()
+    clear_query_cache()
+    clear_result_cache()
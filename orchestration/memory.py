@@ -15,10 +15,24 @@ This enables follow-up questions like:
 "what about last quarter?"
 "only for electronics"
 "break it by region"
+
+Stored intents and their values are shared, not copied: intents are
+treated as read-only once they leave the intent agent.
 """
 
-from typing import Dict, Any, List
-from copy import deepcopy
+from collections import deque
+from typing import Deque, Dict, Any
+
+
+# intent fields that follow-up questions inherit
+_TRACKED_KEYS = frozenset({
+    "target_tables",
+    "metrics",
+    "dimensions",
+    "filters",
+    "time_range",
+    "grain"
+})
 
 
 class IntentMemory:
@@ -31,7 +45,8 @@ class IntentMemory:
 
     def __init__(self, max_history: int = 5):
         self.max_history = max_history
-        self.intent_history: List[Dict[str, Any]] = []
+        # bounded: appending past max_history evicts the oldest entry
+        self.intent_history: Deque[Dict[str, Any]] = deque(maxlen=max_history)
         self.active_context: Dict[str, Any] = {}
 
     # -----------------------------
@@ -41,11 +56,7 @@ class IntentMemory:
     def store_intent(self, intent: Dict[str, Any]):
         """Store finalized intent into memory."""
 
-        self.intent_history.append(deepcopy(intent))
-
-        # keep memory bounded
-        if len(self.intent_history) > self.max_history:
-            self.intent_history.pop(0)
+        self.intent_history.append(intent)
 
         # update active analytical context
         self._update_active_context(intent)
@@ -56,18 +67,9 @@ class IntentMemory:
         This context is what follow-ups will inherit.
         """
 
-        keys_to_track = [
-            "target_tables",
-            "metrics",
-            "dimensions",
-            "filters",
-            "time_range",
-            "grain"
-        ]
-
-        for key in keys_to_track:
-            if intent.get(key):
-                self.active_context[key] = deepcopy(intent[key])
+        for key, value in intent.items():
+            if key in _TRACKED_KEYS and value:
+                self.active_context[key] = value
 
     # -----------------------------
     # Context resolution
@@ -82,11 +84,12 @@ class IntentMemory:
         if not self.active_context:
             return new_intent
 
-        resolved = deepcopy(new_intent)
+        # shallow copy: new keys only, nested values are shared
+        resolved = dict(new_intent)
 
         for key, value in self.active_context.items():
             if not resolved.get(key):
-                resolved[key] = deepcopy(value)
+                resolved[key] = value
 
         return resolved
 
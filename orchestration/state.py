@@ -9,6 +9,8 @@ This is the single source of truth for the orchestration layer.
 
 from typing import TypedDict, Optional, Dict, Any
 
+from agents.router import RoutedIntent
+
 
 class AgentState(TypedDict, total=False):
 
@@ -19,7 +21,7 @@ class AgentState(TypedDict, total=False):
     intent: Dict[str, Any]
 
     # router agent output
-    routed_intent: Dict[str, Any]
+    routed_intent: RoutedIntent
 
     # data agent output
     data_output: Dict[str, Any]
@@ -31,5 +33,5 @@ class AgentState(TypedDict, total=False):
     insight: Dict[str, Any]
 
     # control flags
-    status: str                 # running | blocked | completed
+    status: str                 # running | blocked | skipped | completed
     error: Optional[str]
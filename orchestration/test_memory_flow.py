@@ -1,6 +1,6 @@
-from orchestration.graph import build_graph
+from orchestration.graph import get_app
 
-app = build_graph()
+app = get_app()
 
 app.invoke({"user_query": "Which category has highest revenue?"})
 app.invoke({"user_query": "What about last quarter?"})
@@ -13,11 +13,14 @@
 
 
 import os
+import csv
 import json
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
 
 
 # -----------------------------
@@ -28,6 +31,15 @@ RAW_INPUT_PATH = "C:\\Users\\india\\Desktop\\Blend_360_Project_files\\Blend 360
 RAW_OUTPUT_PATH = "data/raw"            # untouched copies stored here
 REPORT_PATH = "data/raw/ingestion_report.json"
 
+CSV_BLOCK_SIZE = 8 << 20   # bytes parsed per streamed batch
+
+# pandas' default NA markers, so null_percent matches pd.read_csv
+CSV_NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null"
+]
+
 
 # -----------------------------
 # Utility functions
@@ -39,17 +51,46 @@ def ensure_directories():
     os.makedirs(RAW_OUTPUT_PATH, exist_ok=True)
 
 
-def profile_dataframe(df: pd.DataFrame) -> dict:
+def read_csv_header(path: str) -> list:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def profile_csv(path: str) -> dict:
     """
-    Generate basic profiling info for a dataframe.
-    This is lightweight and safe for raw ingestion.
+    Generate basic profiling info for a CSV file.
+
+    Streams the file in record batches with pyarrow, so only null
+    counts are kept in memory. Every column is read as text: no type
+    inference, and nothing is materialized in pandas.
     """
+    column_names = read_csv_header(path)
+
+    reader = pv.open_csv(
+        path,
+        read_options=pv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=pv.ConvertOptions(
+            column_types={col: pa.string() for col in column_names},
+            null_values=CSV_NULL_VALUES,
+            strings_can_be_null=True
+        )
+    )
+
+    rows = 0
+    null_counts = [0] * len(column_names)
+
+    for batch in reader:
+        rows += batch.num_rows
+        for i, column in enumerate(batch.columns):
+            null_counts[i] += column.null_count
+
     profile = {
-        "rows": int(df.shape[0]),
-        "columns": int(df.shape[1]),
-        "column_names": list(df.columns),
+        "rows": rows,
+        "columns": len(column_names),
+        "column_names": column_names,
         "null_percent": {
-            col: float(df[col].isna().mean()) for col in df.columns
+            col: (null_counts[i] / rows if rows else 0.0)
+            for i, col in enumerate(column_names)
         }
     }
     return profile
@@ -59,12 +100,36 @@ def profile_dataframe(df: pd.DataFrame) -> dict:
 # Main ingestion logic
 # -----------------------------
 
+def ingest_one(file_name: str) -> tuple:
+    """Copy and profile a single CSV. Runs in a worker process."""
+
+    source_file = os.path.join(RAW_INPUT_PATH, file_name)
+    target_file = os.path.join(RAW_OUTPUT_PATH, file_name)
+
+    print(f"[INFO] Ingesting file: {file_name}")
+
+    # Copy file exactly as-is (no modification)
+    shutil.copy2(source_file, target_file)
+
+    # Stream CSV for profiling only
+    file_profile = profile_csv(source_file)
+
+    file_profile["file_size_mb"] = round(
+        os.path.getsize(source_file) / (1024 * 1024), 2
+    )
+
+    return file_name, file_profile
+
+
 def ingest_files():
     """
     Main function:
     - scans RAW_INPUT_PATH
     - copies files to RAW_OUTPUT_PATH
-    - loads CSVs and builds ingestion report
+    - profiles CSVs and builds ingestion report
+
+    Files are independent, so they are ingested in parallel
+    across CPU cores.
     """
 
     ingestion_report = {
@@ -72,29 +137,14 @@ def ingest_files():
         "files": {}
     }
 
-    for file_name in os.listdir(RAW_INPUT_PATH):
-
-        if not file_name.lower().endswith(".csv"):
-            continue
-
-        source_file = os.path.join(RAW_INPUT_PATH, file_name)
-        target_file = os.path.join(RAW_OUTPUT_PATH, file_name)
-
-        print(f"[INFO] Ingesting file: {file_name}")
-
-        # Copy file exactly as-is (no modification)
-        shutil.copy2(source_file, target_file)
-
-        # Load CSV for profiling only
-        df = pd.read_csv(source_file)
-
-        file_profile = profile_dataframe(df)
-
-        file_profile["file_size_mb"] = round(
-            os.path.getsize(source_file) / (1024 * 1024), 2
-        )
+    csv_files = [
+        f for f in os.listdir(RAW_INPUT_PATH) if f.lower().endswith(".csv")
+    ]
+    workers = max(1, min(len(csv_files), os.cpu_count() or 1))
 
-        ingestion_report["files"][file_name] = file_profile
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file_name, file_profile in executor.map(ingest_one, csv_files):
+            ingestion_report["files"][file_name] = file_profile
 
     # Save ingestion audit report
     with open(REPORT_PATH, "w", encoding="utf-8") as f:
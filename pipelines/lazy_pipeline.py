@@ -0,0 +1,184 @@
+"""
+lazy_pipeline.py
+
+Purpose:
+--------
+Single-pass alternative to standardization → transformations →
+enrichment for the sales fact.
+
+The raw Amazon and international CSVs are scanned by DuckDB and
+fact_sales_enriched.parquet is written by one SQL plan that fuses
+column projection, type casts, string normalization, null filters
+and time features. No staging or intermediate parquet is written.
+
+Input:
+- data/raw/Amazon Sale Report.csv
+- data/raw/International sale Report.csv
+
+Output:
+- data/processed/fact_sales_enriched.parquet
+
+dim_product and finance_summary still come from run_pipeline.py.
+"""
+
+import os
+
+import duckdb
+
+from ingestion import CSV_NULL_VALUES, read_csv_header
+from standardization import normalize_column_name
+
+
+# -----------------------------
+# Configuration
+# -----------------------------
+
+RAW_PATH = "data/raw"
+PROCESSED_PATH = "data/processed"
+
+AMAZON_FILE = "Amazon Sale Report.csv"
+INTERNATIONAL_FILE = "International sale Report.csv"
+
+# date layouts seen in the raw exports, tried in order
+DATE_FORMATS = ["%m-%d-%y", "%Y-%m-%d", "%m/%d/%Y", "%d-%m-%Y"]
+
+
+# -----------------------------
+# SQL builders
+# -----------------------------
+
+def sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def sql_list(values: list) -> str:
+    return "[" + ", ".join(sql_literal(v) for v in values) + "]"
+
+
+def scan_csv(file_name: str) -> str:
+    """
+    Scan a raw CSV as text with normalized column names, the SQL
+    equivalent of standardize_file's renaming and string trimming.
+    """
+    path = os.path.join(RAW_PATH, file_name)
+    names = [normalize_column_name(raw) for raw in read_csv_header(path)]
+
+    columns = ", ".join(
+        f"NULLIF(TRIM({name}), '') AS {name}"
+        for name in names
+        if "unnamed" not in name
+    )
+
+    return (
+        f"SELECT {columns} FROM read_csv({sql_literal(path)}, header = true, "
+        f"all_varchar = true, names = {sql_list(names)}, "
+        f"nullstr = {sql_list(CSV_NULL_VALUES)})"
+    )
+
+
+def parse_date(col: str) -> str:
+    return f"TRY_STRPTIME({col}, {sql_list(DATE_FORMATS)})"
+
+
+def build_fact_sales_sql() -> str:
+    """Union both sources with fact_sales' canonical columns."""
+
+    amazon = f"""
+        SELECT
+            order_id,
+            {parse_date("date")} AS order_date,
+            sku,
+            style,
+            category,
+            CAST(1 AS BIGINT) AS units,
+            TRY_CAST(amount AS DOUBLE) AS revenue,
+            currency,
+            'domestic' AS region,
+            ship_country AS country,
+            ship_state AS state,
+            ship_city AS city,
+            sales_channel,
+            fulfilment AS fulfillment_type,
+            status AS order_status,
+            TRY_CAST(b2b AS BOOLEAN) AS is_b2b,
+            COALESCE(status ILIKE '%cancel%', false) AS is_cancelled
+        FROM ({scan_csv(AMAZON_FILE)})
+    """
+
+    international = f"""
+        SELECT
+            CAST(NULL AS VARCHAR) AS order_id,
+            {parse_date("date")} AS order_date,
+            sku,
+            style,
+            CAST(NULL AS VARCHAR) AS category,
+            CAST(TRY_CAST(pcs AS DOUBLE) AS BIGINT) AS units,
+            TRY_CAST(gross_amt AS DOUBLE) AS revenue,
+            CAST(NULL AS VARCHAR) AS currency,
+            'international' AS region,
+            CAST(NULL AS VARCHAR) AS country,
+            CAST(NULL AS VARCHAR) AS state,
+            CAST(NULL AS VARCHAR) AS city,
+            'international' AS sales_channel,
+            CAST(NULL AS VARCHAR) AS fulfillment_type,
+            'completed' AS order_status,
+            CAST(NULL AS BOOLEAN) AS is_b2b,
+            false AS is_cancelled
+        FROM ({scan_csv(INTERNATIONAL_FILE)})
+    """
+
+    return f"{amazon}\nUNION ALL\n{international}"
+
+
+def build_fact_sales_enriched_sql() -> str:
+    """fact_sales plus the quality gate, time features and enrichment."""
+
+    return f"""
+        SELECT
+            *,
+            YEAR(order_date) AS year,
+            MONTH(order_date) AS month,
+            STRFTIME(order_date, '%Y') || 'Q' || QUARTER(order_date) AS quarter,
+            COALESCE(LOWER(TRIM(category)), 'unknown') AS category_clean,
+            CASE
+                WHEN region IS NULL THEN 'unknown'
+                WHEN LOWER(region) LIKE '%india%' OR LOWER(region) = 'domestic' THEN 'domestic'
+                ELSE 'international'
+            END AS region_clean,
+            region_clean = 'international' AS is_international,
+            revenue > 5000 AS is_high_value_order,
+            STRFTIME(order_date, '%Y-%m') AS year_month,
+            quarter AS year_quarter
+        FROM ({build_fact_sales_sql()})
+        WHERE revenue IS NOT NULL
+          AND units IS NOT NULL
+          AND order_date IS NOT NULL
+    """
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+
+def run_lazy_pipeline():
+
+    print("[INFO] Building fact_sales_enriched in a single DuckDB pass...")
+
+    os.makedirs(PROCESSED_PATH, exist_ok=True)
+    output_path = os.path.join(PROCESSED_PATH, "fact_sales_enriched.parquet")
+
+    con = duckdb.connect()
+    try:
+        con.execute(
+            f"COPY ({build_fact_sales_enriched_sql()}) "
+            f"TO {sql_literal(output_path)} "
+            f"(FORMAT parquet, COMPRESSION zstd)"
+        )
+    finally:
+        con.close()
+
+    print(f"[OK] Saved: {output_path}")
+
+
+if __name__ == "__main__":
+    run_lazy_pipeline()
@@ -15,7 +15,12 @@ Output:
 
 import os
 import json
-import pandas as pd
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 PROCESSED_PATH = "data/processed"
 PROFILE_PATH = "data/profiles"
@@ -26,55 +31,128 @@ os.makedirs(PROFILE_PATH, exist_ok=True)
 # -----------------------------
 # Profiling functions
 # -----------------------------
+# Tables are streamed from a memory-mapped parquet file in record
+# batches; per-column accumulators are updated with Arrow compute
+# kernels, so memory stays flat regardless of table size.
+
+BATCH_SIZE = 100_000
+
+
+def is_numeric_type(arrow_type: pa.DataType) -> bool:
+    return pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)
+
+
+def is_text_type(arrow_type: pa.DataType) -> bool:
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+
+def as_float(value) -> float:
+    return float("nan") if value is None else float(value)
+
+
+def update_numeric(acc: dict, column: pa.Array):
+    """Fold one batch into a running min / max / sum / count."""
+    min_max = pc.min_max(column)
+    low, high = min_max["min"].as_py(), min_max["max"].as_py()
+
+    if low is not None:
+        acc["min"] = low if acc["min"] is None else min(acc["min"], low)
+        acc["max"] = high if acc["max"] is None else max(acc["max"], high)
+        acc["sum"] += pc.sum(column).as_py()
+        acc["count"] += len(column) - column.null_count
+
+
+def update_counts(counter: Counter, column: pa.Array):
+    """Fold one batch's non-null value counts into a Counter."""
+    counts = pc.value_counts(column)
+    values = counts.field("values")
+    valid = pc.is_valid(values)
+
+    counter.update(dict(zip(
+        values.filter(valid).to_pylist(),
+        counts.field("counts").filter(valid).to_pylist()
+    )))
+
+
+def profile_parquet(path: str, table_name: str) -> dict:
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    schema = parquet_file.schema_arrow
+    row_count = parquet_file.metadata.num_rows
+
+    null_counts = {col: 0 for col in schema.names}
+    numeric = {
+        field.name: {"min": None, "max": None, "sum": 0, "count": 0}
+        for field in schema if is_numeric_type(field.type)
+    }
+    text = {
+        field.name: Counter()
+        for field in schema if is_text_type(field.type)
+    }
+
+    for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE):
+        for col, column in zip(batch.schema.names, batch.columns):
+
+            # NaN counts as missing, as in pandas
+            if pa.types.is_floating(column.type):
+                column = pc.if_else(pc.is_nan(column), None, column)
+
+            null_counts[col] += column.null_count
+
+            if col in numeric:
+                update_numeric(numeric[col], column)
+            elif col in text:
+                update_counts(text[col], column)
 
-def profile_dataframe(df: pd.DataFrame, table_name: str) -> dict:
     profile = {
         "table": table_name,
-        "row_count": int(len(df)),
-        "column_count": int(df.shape[1]),
-        "null_percentage": {},
-        "numeric_summary": {},
-        "top_values": {}
+        "row_count": int(row_count),
+        "column_count": len(schema.names),
+        "null_percentage": {
+            col: (nulls / row_count if row_count else float("nan"))
+            for col, nulls in null_counts.items()
+        },
+        "numeric_summary": {
+            col: {
+                "min": as_float(acc["min"]),
+                "max": as_float(acc["max"]),
+                "mean": acc["sum"] / acc["count"] if acc["count"] else float("nan")
+            }
+            for col, acc in numeric.items()
+        },
+        "top_values": {
+            col: dict(counter.most_common(5))
+            for col, counter in text.items()
+        }
     }
 
-    # null stats
-    for col in df.columns:
-        profile["null_percentage"][col] = float(df[col].isna().mean())
-
-    # numeric stats
-    num_df = df.select_dtypes(include="number")
-    for col in num_df.columns:
-        profile["numeric_summary"][col] = {
-            "min": float(num_df[col].min()),
-            "max": float(num_df[col].max()),
-            "mean": float(num_df[col].mean())
-        }
+    return profile
 
-    # top categorical values
-    cat_df = df.select_dtypes(include="object")
-    for col in cat_df.columns:
-        profile["top_values"][col] = cat_df[col].value_counts().head(5).to_dict()
 
-    return profile
+def profile_file(file: str) -> str:
+    """Profile one parquet table and save its JSON. Runs in a worker process."""
 
+    table_name = file.replace(".parquet", "")
+    print(f"[INFO] Profiling {table_name}")
 
-def run_profiling():
+    profile = profile_parquet(os.path.join(PROCESSED_PATH, file), table_name)
 
-    for file in os.listdir(PROCESSED_PATH):
+    output_file = os.path.join(PROFILE_PATH, f"{table_name}_profile.json")
+    with open(output_file, "w") as f:
+        json.dump(profile, f, indent=4)
 
-        if file.endswith(".parquet"):
+    print(f"[OK] Profile saved: {output_file}")
+    return output_file
 
-            table_name = file.replace(".parquet", "")
-            print(f"[INFO] Profiling {table_name}")
 
-            df = pd.read_parquet(os.path.join(PROCESSED_PATH, file))
-            profile = profile_dataframe(df, table_name)
+def run_profiling():
 
-            output_file = os.path.join(PROFILE_PATH, f"{table_name}_profile.json")
-            with open(output_file, "w") as f:
-                json.dump(profile, f, indent=4)
+    files = [f for f in os.listdir(PROCESSED_PATH) if f.endswith(".parquet")]
+    workers = max(1, min(len(files), os.cpu_count() or 1))
 
-            print(f"[OK] Profile saved: {output_file}")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(profile_file, files))
 
 
 # -----------------------------
@@ -3,7 +3,7 @@ standardization.py
 
 Purpose:
 --------
-Standardize raw datasets into clean, schema-stable CSVs.
+Standardize raw datasets into clean, schema-stable parquet files.
 
 Operations performed:
 - normalize column names
@@ -14,11 +14,16 @@ Operations performed:
 - remove obvious junk values
 
 This script does NOT create canonical tables.
-It only prepares consistent staging datasets.
+It only prepares consistent staging datasets. Staging is written
+as parquet so parsed dates and numeric types survive to the
+transformation step without a second CSV parse.
 """
 
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import pandas as pd
 
 
@@ -31,11 +36,15 @@ STAGING_PATH = "data/staging"
 
 os.makedirs(STAGING_PATH, exist_ok=True)
 
+_NON_WORD_RE = re.compile(r"[^\w]+")
+_MULTI_UNDERSCORE_RE = re.compile(r"_+")
+
 
 # -----------------------------
 # Helper functions
 # -----------------------------
 
+@lru_cache(maxsize=4096)
 def normalize_column_name(col: str) -> str:
     """
     Convert column names into machine-friendly format:
@@ -43,19 +52,33 @@ def normalize_column_name(col: str) -> str:
     - replace spaces and symbols with underscores
     - remove duplicate underscores
     """
-    col = col.strip().lower()
-    col = re.sub(r"[^\w]+", "_", col)
-    col = re.sub(r"_+", "_", col)
-    return col.strip("_")
+    col = _NON_WORD_RE.sub("_", col.strip().lower())
+    return _MULTI_UNDERSCORE_RE.sub("_", col).strip("_")
 
 
 def basic_string_cleanup(df: pd.DataFrame) -> pd.DataFrame:
-    """Strip spaces from all string columns."""
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].astype(str).str.strip()
+    """
+    Strip spaces from all string columns.
+
+    Pure string columns are stripped in place of a per-cell str()
+    copy; only mixed object columns are stringified first. Missing
+    values stay missing.
+    """
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        values = df[col]
+        if pd.api.types.infer_dtype(values, skipna=True) != "string":
+            values = values.where(values.isna(), values.astype(str))
+        df[col] = values.str.strip()
     return df
 
 
+def as_text(values: pd.Series) -> pd.Series:
+    """Cast to text unless the column already holds strings."""
+    if pd.api.types.is_string_dtype(values):
+        return values
+    return values.astype(str)
+
+
 def remove_unnamed_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Drop columns like 'Unnamed: 0'."""
     unnamed_cols = [c for c in df.columns if "unnamed" in c.lower()]
@@ -101,26 +124,25 @@ def enforce_retail_schema(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
 
     # ---- Identifiers (never numeric) ----
+    # (string columns were already cleaned; only re-cast the rest)
     for col in ["order_id", "product_id", "customer_id", "store_id"]:
         if col in df.columns:
-            df[col] = df[col].astype(str)
+            df[col] = as_text(df[col])
 
     # ---- Dimensions ----
     for col in ["category", "subcategory", "region", "country", "state", "channel"]:
         if col in df.columns:
-            df[col] = df[col].astype(str)
+            df[col] = as_text(df[col])
 
     # ---- Date fields ----
     for col in ["order_date", "purchase_date", "transaction_date"]:
         if col in df.columns:
             df[col] = pd.to_datetime(df[col], errors="coerce")
 
-    # ---- Data quality filters ----
-    if "revenue" in df.columns:
-        df = df[df["revenue"].notna()]
-
-    if "units" in df.columns:
-        df = df[df["units"].notna()]
+    # ---- Data quality filters (one filtered copy) ----
+    required = [col for col in ("revenue", "units") if col in df.columns]
+    if required:
+        df = df.dropna(subset=required)
 
     return df
 
@@ -130,12 +152,14 @@ def enforce_retail_schema(df: pd.DataFrame) -> pd.DataFrame:
 # -----------------------------
 
 def standardize_file(file_name: str):
-    """Standardize a single raw CSV and save to staging."""
+    """Standardize a single raw CSV and save to staging as parquet."""
 
     print(f"[INFO] Standardizing: {file_name}")
 
     input_path = os.path.join(RAW_PATH, file_name)
-    output_path = os.path.join(STAGING_PATH, file_name)
+    output_path = os.path.join(
+        STAGING_PATH, os.path.splitext(file_name)[0] + ".parquet"
+    )
 
     df = pd.read_csv(input_path)
 
@@ -158,17 +182,20 @@ def standardize_file(file_name: str):
     df = enforce_retail_schema(df)
 
     # Save standardized dataset
-    df.to_csv(output_path, index=False)
+    df.to_parquet(output_path, index=False, compression="zstd")
 
     print(f"[OK] Saved standardized file to: {output_path}")
 
 
 def run_standardization():
-    """Run standardization on all raw CSV files."""
+    """Run standardization on all raw CSV files, one per worker process."""
+
+    csv_files = [f for f in os.listdir(RAW_PATH) if f.lower().endswith(".csv")]
+    workers = max(1, min(len(csv_files), os.cpu_count() or 1))
 
-    for file_name in os.listdir(RAW_PATH):
-        if file_name.lower().endswith(".csv"):
-            standardize_file(file_name)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # list() surfaces the first worker exception here
+        list(executor.map(standardize_file, csv_files))
 
     print("\n[INFO] Standardization completed.")
 
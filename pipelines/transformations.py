@@ -14,18 +14,46 @@ This is the heart of the analytical data foundation.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 STAGING_PATH = "data/staging"
 PROCESSED_PATH = "data/processed"
 
 os.makedirs(PROCESSED_PATH, exist_ok=True)
 
+STAGING_TABLES = (
+    "Amazon Sale Report",
+    "International sale Report",
+    "Sale Report",
+    "May-2022",
+    "P  L March 2021",
+    "Expense IIGF"
+)
+
 
 # -----------------------------
 # Utility helpers
 # -----------------------------
 
+def read_staging(name: str) -> pd.DataFrame:
+    """Load a standardized staging table (types already enforced)."""
+    return pd.read_parquet(os.path.join(STAGING_PATH, f"{name}.parquet"))
+
+
+def load_staging() -> Dict[str, pd.DataFrame]:
+    """
+    Read every staging table once, concurrently (parquet decoding
+    releases the GIL), so builders share frames instead of paths.
+    """
+    with ThreadPoolExecutor(max_workers=len(STAGING_TABLES)) as executor:
+        return dict(zip(STAGING_TABLES, executor.map(read_staging, STAGING_TABLES)))
+
+
 def add_time_features(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
     """Add year, month, quarter columns from a date field."""
     df["year"] = df[date_col].dt.year
@@ -69,10 +97,8 @@ def enforce_fact_sales_schema(df: pd.DataFrame) -> pd.DataFrame:
     if "is_b2b" in df.columns:
         df["is_b2b"] = df["is_b2b"].astype("boolean")
 
-    # ---- data quality gate ----
-    df = df[df["revenue"].notna()]
-    df = df[df["units"].notna()]
-    df = df[df["order_date"].notna()]
+    # ---- data quality gate (one filtered copy) ----
+    df = df.dropna(subset=["revenue", "units", "order_date"])
 
     return df
 
@@ -81,17 +107,23 @@ def enforce_fact_sales_schema(df: pd.DataFrame) -> pd.DataFrame:
 # FACT SALES
 # -----------------------------
 
-def build_fact_sales() -> pd.DataFrame:
-    """Build unified fact_sales table from domestic and international sales."""
+def build_fact_sales(staging: Dict[str, pd.DataFrame]) -> pa.Table:
+    """
+    Build unified fact_sales table from domestic and international sales.
+
+    Each source is schema-enforced on its own (the rules are per row),
+    then the two are unioned as Arrow tables: concat_tables chains the
+    column chunks instead of copying both frames into a new one.
+    """
 
     print("[INFO] Building fact_sales...")
 
     # ---- Amazon domestic sales ----
-    amazon = pd.read_csv(os.path.join(STAGING_PATH, "Amazon Sale Report.csv"))
+    amazon = staging["Amazon Sale Report"]
 
     amazon_fact = pd.DataFrame({
         "order_id": amazon.get("order_id"),
-        "order_date": pd.to_datetime(amazon.get("date"), errors="coerce"),
+        "order_date": amazon.get("date"),
         "sku": amazon.get("sku"),
         "style": amazon.get("style"),
         "category": amazon.get("category"),
@@ -108,15 +140,17 @@ def build_fact_sales() -> pd.DataFrame:
         "is_b2b": amazon.get("b2b")
     })
 
-    amazon_fact["is_cancelled"] = amazon_fact["order_status"].str.contains("cancel", case=False, na=False)
+    # plain substring search on lowered text; no regex engine per row
+    status_lower = amazon_fact["order_status"].str.lower()
+    amazon_fact["is_cancelled"] = status_lower.str.contains("cancel", regex=False, na=False)
     amazon_fact = add_time_features(amazon_fact, "order_date")
 
     # ---- International sales ----
-    intl = pd.read_csv(os.path.join(STAGING_PATH, "International sale Report.csv"))
+    intl = staging["International sale Report"]
 
     intl_fact = pd.DataFrame({
         "order_id": None,
-        "order_date": pd.to_datetime(intl.get("date"), errors="coerce"),
+        "order_date": intl.get("date"),
         "sku": intl.get("sku"),
         "style": intl.get("style"),
         "category": None,
@@ -136,9 +170,17 @@ def build_fact_sales() -> pd.DataFrame:
     intl_fact["is_cancelled"] = False
     intl_fact = add_time_features(intl_fact, "order_date")
 
-    # ---- Union & schema enforcement ----
-    fact_sales = pd.concat([amazon_fact, intl_fact], ignore_index=True)
-    fact_sales = enforce_fact_sales_schema(fact_sales)
+    # ---- Schema enforcement & union ----
+    # "permissive" widens mismatched numeric types the way pd.concat
+    # did: a source with an unparseable date carries float64 year and
+    # month (time features come before the null gate), the other int32
+    fact_sales = pa.concat_tables(
+        [
+            pa.Table.from_pandas(enforce_fact_sales_schema(amazon_fact), preserve_index=False),
+            pa.Table.from_pandas(enforce_fact_sales_schema(intl_fact), preserve_index=False)
+        ],
+        promote_options="permissive"
+    )
 
     return fact_sales
 
@@ -147,14 +189,14 @@ def build_fact_sales() -> pd.DataFrame:
 # DIM PRODUCT
 # -----------------------------
 
-def build_dim_product() -> pd.DataFrame:
+def build_dim_product(staging: Dict[str, pd.DataFrame]) -> pd.DataFrame:
     """Build unified product dimension."""
 
     print("[INFO] Building dim_product...")
 
-    product = pd.read_csv(os.path.join(STAGING_PATH, "Sale Report.csv"))
-    pricing_may = pd.read_csv(os.path.join(STAGING_PATH, "May-2022.csv"))
-    pricing_pl = pd.read_csv(os.path.join(STAGING_PATH, "P  L March 2021.csv"))
+    product = staging["Sale Report"]
+    pricing_may = staging["May-2022"]
+    pricing_pl = staging["P  L March 2021"]
 
     product_dim = pd.DataFrame({
         "sku": product.get("sku_code").astype(str),
@@ -180,7 +222,7 @@ def build_dim_product() -> pd.DataFrame:
 # FINANCE SUMMARY 
 # -----------------------------
 
-def build_fact_finance() -> pd.DataFrame:
+def build_fact_finance(staging: Dict[str, pd.DataFrame]) -> pd.DataFrame:
     """
     Build finance summary table.
 
@@ -189,8 +231,8 @@ def build_fact_finance() -> pd.DataFrame:
 
     print("[INFO] Building finance summary table...")
 
-    expense = pd.read_csv(os.path.join(STAGING_PATH, "Expense IIGF.csv"))
-    expense.columns = [c.strip().lower() for c in expense.columns]
+    # rename() returns a new frame; the shared staging frame is untouched
+    expense = staging["Expense IIGF"].rename(columns=lambda c: c.strip().lower())
 
     if "recived_amount" not in expense.columns or "expance" not in expense.columns:
         raise ValueError("Finance file missing expected columns: recived_amount, expance")
@@ -211,11 +253,13 @@ def build_fact_finance() -> pd.DataFrame:
 # -----------------------------
 
 def run_transformations():
-    fact_sales = build_fact_sales()
-    dim_product = build_dim_product()
-    finance_summary = build_fact_finance()
+    staging = load_staging()
+
+    fact_sales = build_fact_sales(staging)
+    dim_product = build_dim_product(staging)
+    finance_summary = build_fact_finance(staging)
 
-    fact_sales.to_parquet(os.path.join(PROCESSED_PATH, "fact_sales.parquet"), index=False)
+    pq.write_table(fact_sales, os.path.join(PROCESSED_PATH, "fact_sales.parquet"))
     dim_product.to_parquet(os.path.join(PROCESSED_PATH, "dim_product.parquet"), index=False)
     finance_summary.to_parquet(os.path.join(PROCESSED_PATH, "finance_summary.parquet"), index=False)
 
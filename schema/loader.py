@@ -0,0 +1,176 @@
+"""
+loader.py
+
+Purpose:
+--------
+Shared, cached loader for the YAML contracts in schema/.
+
+All agents read the schema registry and business rules through
+this module. Parsed documents are cached per (path, mtime), so
+each file is parsed once per process and re-parsed only when it
+changes on disk.
+
+Parsed documents are also pickled to CACHE_DIR, so new worker
+processes restore them instead of re-parsing YAML.
+"""
+
+import os
+import pickle
+import pickletools
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple
+
+import yaml
+
+# libyaml C parser when available, pure-Python fallback otherwise
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+
+# -----------------------------
+# Configuration
+# -----------------------------
+
+REGISTRY_PATH = "schema/registry.yaml"
+BUSINESS_RULES_PATH = "schema/business_rules.yaml"
+
+CACHE_DIR = os.getenv("RIA_CACHE_DIR", ".cache")
+
+
+# -----------------------------
+# Cached loading
+# -----------------------------
+
+def _pickle_path(path: str) -> str:
+    return os.path.join(CACHE_DIR, os.path.basename(path) + ".pkl")
+
+
+def _read_pickle(path: str, mtime: float):
+    """
+    Return the pickled document if it was built from this mtime.
+
+    A missing, partial, stale or foreign cache file returns None, so
+    the caller re-parses the YAML instead of failing.
+    """
+    try:
+        with open(_pickle_path(path), "rb") as f:
+            state = pickle.load(f)
+    except (
+        OSError, EOFError, pickle.UnpicklingError,
+        AttributeError, ImportError, ValueError, TypeError
+    ):
+        return None
+
+    if not isinstance(state, dict) or state.get("mtime") != mtime:
+        return None
+
+    data = state.get("data")
+    if not isinstance(data, dict):
+        return None
+
+    return data
+
+
+def _write_pickle(path: str, mtime: float, data: dict):
+    """Best-effort write; a read-only filesystem just skips the cache."""
+    target = _pickle_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        payload = pickletools.optimize(
+            pickle.dumps({"mtime": mtime, "data": data}, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, target)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=8)
+def _load(path: str, mtime: float) -> dict:
+    """Parse a YAML file. Cache key includes mtime so edits invalidate it."""
+    data = _read_pickle(path, mtime)
+    if data is not None:
+        return data
+
+    with open(path, "r") as f:
+        data = yaml.load(f, Loader=YamlLoader)
+
+    _write_pickle(path, mtime, data)
+    return data
+
+
+def load_yaml(path: str) -> dict:
+    return _load(path, os.path.getmtime(path))
+
+
+def get_schema(path: str = REGISTRY_PATH) -> dict:
+    """Return the parsed schema registry."""
+    return load_yaml(path)
+
+
+def get_business_rules(path: str = BUSINESS_RULES_PATH) -> dict:
+    """Return the parsed business rules."""
+    return load_yaml(path)
+
+
+def get_schema_version() -> tuple:
+    """mtimes of the registry and business rules; changes on any edit."""
+    return (
+        os.path.getmtime(REGISTRY_PATH),
+        os.path.getmtime(BUSINESS_RULES_PATH)
+    )
+
+
+# -----------------------------
+# Derived lookup tables
+# -----------------------------
+
+@lru_cache(maxsize=8)
+def _build_index(path: str, mtime: float) -> dict:
+    """
+    Precompute schema lookups used on the request path.
+
+    - available_columns: {table: frozenset(columns)}
+    - dimension_index: {column: (tables...)}, dim_* tables first,
+      so dimension resolution prefers product attributes over facts
+    - dimension_columns: every column with role 'dimension'
+    """
+    schema = _load(path, mtime)
+    tables = schema["tables"]
+
+    available_columns: Dict[str, FrozenSet[str]] = {
+        table: frozenset(meta["columns"]) for table, meta in tables.items()
+    }
+
+    ordered_tables = (
+        [t for t in tables if t.startswith("dim_")] +
+        [t for t in tables if t.startswith("fact_")]
+    )
+
+    dimension_index: Dict[str, Tuple[str, ...]] = {}
+    for table in ordered_tables:
+        for col in tables[table]["columns"]:
+            dimension_index[col] = dimension_index.get(col, ()) + (table,)
+
+    dimension_columns = frozenset(
+        col
+        for meta in tables.values()
+        for col, spec in meta["columns"].items()
+        if spec.get("role") == "dimension"
+    )
+
+    return {
+        "available_columns": available_columns,
+        "dimension_index": dimension_index,
+        "dimension_columns": dimension_columns
+    }
+
+
+def get_schema_index(path: str = REGISTRY_PATH) -> dict:
+    """Return precomputed lookups for the schema registry."""
+    return _build_index(path, os.path.getmtime(path))
@@ -0,0 +1,131 @@
+"""
+backend.py
+
+Purpose:
+--------
+Query backend interface behind run_query and stream_query.
+
+duckdb_loader.py owns everything engine-neutral (view setup, result
+cache, projection checks, dimension encoding) and hands execution to
+a Backend. Another engine (Snowflake, Postgres, MotherDuck) plugs in
+by implementing the same two Arrow-returning methods, without
+changes to agents.
+"""
+
+import os
+import threading
+from typing import Any, Iterator, Protocol, Sequence
+
+import duckdb
+import pyarrow as pa
+
+from .pool import DuckDBPool
+
+
+# -----------------------------
+# Configuration
+# -----------------------------
+
+# rows per Arrow record batch read from the engine
+BATCH_ROWS = 100_000
+
+# a runaway query (no WHERE, cartesian join) would otherwise hold a
+# pooled connection indefinitely or fill memory with its result
+QUERY_TIMEOUT_S = float(os.getenv("RIA_QUERY_TIMEOUT_S", "30"))
+MAX_ROWS = int(os.getenv("RIA_MAX_ROWS", "100000"))
+
+
+class QueryTimeout(ValueError):
+    """The query ran longer than QUERY_TIMEOUT_S and was interrupted."""
+
+
+class QueryTooLarge(ValueError):
+    """The query returned more than MAX_ROWS rows."""
+
+
+# -----------------------------
+# Interface
+# -----------------------------
+
+class Backend(Protocol):
+
+    def execute_arrow(self, sql: str, params: Sequence[Any] = ()) -> pa.Table:
+        """Run SQL with bound params; the full result as one Arrow table."""
+        ...
+
+    def stream(
+        self,
+        sql: str,
+        params: Sequence[Any] = (),
+        batch_rows: int = BATCH_ROWS
+    ) -> Iterator[pa.RecordBatch]:
+        """Run SQL with bound params; the result as Arrow batches."""
+        ...
+
+
+# -----------------------------
+# DuckDB
+# -----------------------------
+
+class DuckDBBackend:
+    """Backend over a pool of cursors on the shared DuckDB database."""
+
+    def __init__(
+        self,
+        pool: DuckDBPool,
+        timeout_s: float = QUERY_TIMEOUT_S,
+        max_rows: int = MAX_ROWS
+    ):
+        self.pool = pool
+        self.timeout_s = timeout_s
+        self.max_rows = max_rows
+
+    def execute_arrow(self, sql: str, params: Sequence[Any] = ()) -> pa.Table:
+        """
+        Raises QueryTimeout after timeout_s and QueryTooLarge past
+        max_rows rows.
+        """
+
+        with self.pool.acquire() as con:
+            # interrupt() only cancels a running query, so a timer firing
+            # just after completion leaves the pooled connection usable
+            timer = threading.Timer(self.timeout_s, con.interrupt)
+            timer.start()
+
+            try:
+                reader = con.execute(sql, params).to_arrow_reader(BATCH_ROWS)
+
+                # read batch by batch so an oversized result is refused
+                # before it is materialized
+                batches = []
+                n_rows = 0
+                for batch in reader:
+                    n_rows += batch.num_rows
+                    if n_rows > self.max_rows:
+                        raise QueryTooLarge(
+                            f"Query returned more than {self.max_rows} rows; "
+                            "aggregate or filter further"
+                        )
+                    batches.append(batch)
+
+                return pa.Table.from_batches(batches, schema=reader.schema)
+
+            except duckdb.InterruptException as e:
+                raise QueryTimeout(
+                    f"Query exceeded {self.timeout_s:g}s and was cancelled"
+                ) from e
+
+            finally:
+                timer.cancel()
+
+    def stream(
+        self,
+        sql: str,
+        params: Sequence[Any] = (),
+        batch_rows: int = BATCH_ROWS
+    ) -> Iterator[pa.RecordBatch]:
+        """The pooled connection is held until the generator finishes."""
+
+        with self.pool.acquire() as con:
+            reader = con.execute(sql, params).to_arrow_reader(batch_rows)
+            yield from reader
@@ -8,21 +8,102 @@ Centralized database connection manager.
 All database access must go through this module.
 This allows future replacement of DuckDB with
 Snowflake / BigQuery / Postgres without changing agents.
+
+The database is opened once per process. Callers get cursors:
+independent connections that share the one database instance, so
+there is no per-query file open or catalog load.
+
+By default the database is in memory: the tables are views over
+parquet, so a file adds nothing but a catalog, and the external file
+cache keeps recently read parquet data in RAM across queries. Set
+RIA_DB_PATH to use a database file instead.
 """
 
+import os
+import threading
+
 import duckdb
 
-DB_PATH = "storage/retail.duckdb"
+DB_PATH = os.getenv("RIA_DB_PATH", ":memory:")
+
+# an in-memory catalog is private to the process and starts empty
+IN_MEMORY = DB_PATH == ":memory:"
+
+# database-wide settings, applied once when the handle is opened;
+# every cursor and pooled connection shares them
+DB_CONFIG = {
+    "threads": int(os.getenv("RIA_THREADS", str(os.cpu_count() or 1))),
+    "memory_limit": os.getenv("RIA_MEM", "2GB"),
+    # lets parquet scans emit batches out of order, across more threads
+    "preserve_insertion_order": False,
+    # keep parquet footers cached between scans of the same file
+    "enable_object_cache": True,
+    # cache parquet data read by scans; bounded by memory_limit
+    "enable_external_file_cache": True,
+}
+
+
+# -----------------------------
+# Shared database handle
+# -----------------------------
+
+_db = None
+_db_read_only = True
+_db_lock = threading.Lock()
+
+
+def get_database(read_only: bool = False) -> duckdb.DuckDBPyConnection:
+    """
+    Return the process-wide database handle, opening it on first use.
+
+    DuckDB allows only one configuration per file and process, so a
+    read-write handle also serves readers. Asking for write access
+    while a read-only handle is open is an error.
+    """
+
+    global _db, _db_read_only
+
+    # an in-memory database cannot be opened read-only, and no other
+    # process can see it anyway
+    read_only = read_only and not IN_MEMORY
+
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = duckdb.connect(
+                    database=DB_PATH, read_only=read_only, config=DB_CONFIG
+                )
+                _db_read_only = read_only
+
+    if _db_read_only and not read_only:
+        raise ValueError(
+            "Database is already open read-only in this process; "
+            "write access needs a separate process"
+        )
+
+    return _db
 
 
 def get_connection(read_only: bool = False):
     """
-    Create and return a DuckDB connection.
+    Return a new cursor on the shared DuckDB database.
 
     Args:
         read_only (bool): if True, opens DB in read-only mode
+            (only on the first call in the process)
 
     Returns:
         duckdb.DuckDBPyConnection
     """
-    return duckdb.connect(database=DB_PATH, read_only=read_only)
+    return get_database(read_only).cursor()
+
+
+def close_database():
+    """Close the shared handle; the next call reopens it."""
+
+    global _db
+
+    with _db_lock:
+        if _db is not None:
+            _db.close()
+            _db = None
@@ -7,14 +7,30 @@ Creates and manages the DuckDB analytical layer.
 
 Responsibilities:
 - initialize DuckDB database
-- load enriched parquet tables
-- expose safe SQL execution function
+- register enriched parquet tables as views
+- expose safe SQL execution function, run by a storage Backend
 - serve as the ONLY data access layer for agents
 """
 
+import json
 import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
 import pandas as pd
-from .connection import get_connection
+import pyarrow as pa
+import pyarrow.compute as pc
+from .connection import IN_MEMORY, get_connection
+from .backend import (
+    BATCH_ROWS, Backend, DuckDBBackend, QueryTimeout, QueryTooLarge
+)
+from .pool import read_pool
+from schema.loader import get_schema, get_schema_index
 
 
 # -----------------------------
@@ -29,58 +45,574 @@ TABLES = {
     "finance_summary": "finance_summary.parquet"
 }
 
+# low-cardinality dimensions returned as pandas 'category' dtype
+KNOWN_DIM_COLS = get_schema_index()["dimension_columns"]
+
+# rows per record batch yielded by stream_query
+STREAM_BATCH_ROWS = BATCH_ROWS
+
+# executes every query; swap in another Backend to change engines
+backend: Backend = DuckDBBackend(read_pool)
+
 
 # -----------------------------
 # Database setup
 # -----------------------------
 
-def initialize_database():
+def quote_literal(value: str) -> str:
+    """SQL string literal; quotes inside the value are doubled."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def register_table(table: str, file_path: str):
     """
-    Load parquet tables into DuckDB.
-    This can be rerun safely (tables replaced).
+    Create one view on its own cursor, so registrations can overlap,
+    and warm its parquet metadata.
+
+    View definitions cannot take bound parameters, so the table name
+    must be a TABLES key and the path is embedded as an escaped literal.
     """
 
-    print("[INFO] Initializing DuckDB warehouse...")
+    if table not in TABLES:
+        raise ValueError(f"Unknown table: {table}")
+
+    print(f"[INFO] Registering {table} over {os.path.basename(file_path)}")
 
     con = get_connection()
 
-    for table, file in TABLES.items():
+    try:
+        # one commit per table: the legacy drop and the new view land
+        # together, and a file database writes one WAL entry for both
+        con.begin()
+
+        try:
+            # databases built before views held copied tables; DROP TABLE
+            # errors on an existing view, so only drop real tables
+            is_table = con.execute(
+                "SELECT 1 FROM information_schema.tables "
+                "WHERE table_name = ? AND table_type = 'BASE TABLE'",
+                [table]
+            ).fetchone()
+
+            if is_table:
+                con.execute(f"DROP TABLE {table}")
+
+            con.execute(f"""
+                CREATE OR REPLACE VIEW {table} AS
+                SELECT * FROM read_parquet({quote_literal(file_path)})
+            """)
+
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+
+        # COUNT(*) is answered from the footer: parsing it here puts the
+        # file's metadata in the object cache before the first query
+        con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+    finally:
+        con.close()
 
-        file_path = os.path.join(DATA_PATH, file)
 
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Missing parquet file: {file_path}")
+def source_mtime(spec: dict) -> float:
+    """mtime of the parquet file behind a rollup's source table."""
+    return os.path.getmtime(os.path.join(DATA_PATH, TABLES[spec["source"]]))
+
+
+# source parquet mtime each rollup was built from; a database file
+# also keeps it in _rollup_meta for other processes
+_rollup_mtimes: Dict[str, float] = {}
+_rollup_mtimes_loaded = False
+
+
+def build_rollup(name: str, spec: dict):
+    """
+    Materialize one registry rollup: its source grouped by the rollup
+    dimensions, with each additive metric summed under its own name.
+    Columns listed under truncate_to_day are grouped by calendar day.
+    """
+
+    truncated = set(spec.get("truncate_to_day", ()))
+    dimensions = ", ".join(
+        f"date_trunc('day', {d}) AS {d}" if d in truncated else d
+        for d in spec["dimensions"]
+    )
+    metrics = ", ".join(f"SUM({m}) AS {m}" for m in spec["metrics"])
+
+    print(f"[INFO] Building rollup {name} from {spec['source']}")
 
-        print(f"[INFO] Loading {table} from {file}")
+    # taken before the scan: a rewrite during the build reads as stale
+    mtime = source_mtime(spec)
 
+    con = get_connection()
+
+    try:
         con.execute(f"""
-            CREATE OR REPLACE TABLE {table} AS
-            SELECT * FROM read_parquet('{file_path}')
+            CREATE OR REPLACE TABLE {name} AS
+            SELECT {dimensions}, {metrics}
+            FROM {spec['source']}
+            GROUP BY ALL
         """)
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS _rollup_meta "
+            "(name VARCHAR PRIMARY KEY, source_mtime DOUBLE)"
+        )
+        con.execute("INSERT OR REPLACE INTO _rollup_meta VALUES (?, ?)", [name, mtime])
+    finally:
+        con.close()
+
+    _rollup_mtimes[name] = mtime
+
+
+def _recorded_mtimes() -> Dict[str, float]:
+    """Rollup build mtimes, read from a database file on first use."""
+
+    global _rollup_mtimes_loaded
+
+    if not _rollup_mtimes_loaded and not IN_MEMORY:
+        con = get_connection(read_only=True)
+
+        try:
+            has_meta = con.execute(
+                "SELECT 1 FROM information_schema.tables WHERE table_name = '_rollup_meta'"
+            ).fetchone()
+            if has_meta:
+                rows = con.execute("SELECT name, source_mtime FROM _rollup_meta").fetchall()
+                for name, mtime in rows:
+                    _rollup_mtimes.setdefault(name, mtime)
+        finally:
+            con.close()
+
+        _rollup_mtimes_loaded = True
+
+    return _rollup_mtimes
+
+
+def stale_rollups() -> List[str]:
+    """Rollups whose source parquet changed since they were built."""
+    recorded = _recorded_mtimes()
+
+    return [
+        name for name, spec in get_schema().get("rollups", {}).items()
+        if recorded.get(name) != source_mtime(spec)
+    ]
+
+
+def resolve_rollups(sql: str) -> str:
+    """
+    Point references to a stale rollup at its source table instead.
+
+    Callers alias a rollup to its source ('FROM fact_sales_daily AS
+    fact_sales') and only use columns it keeps, so the source answers
+    the same SQL. An in-memory database has already rebuilt stale
+    rollups in ensure_database(); a database file keeps falling back
+    until it is initialized again.
+    """
+
+    rollups = get_schema().get("rollups", {})
+    named = [name for name in rollups if re.search(rf"\b{name}\b", sql)]
+    if not named:
+        return sql
 
+    stale = set(stale_rollups())
+    for name in named:
+        if name in stale:
+            sql = re.sub(rf"\b{name}\b", rollups[name]["source"], sql)
+
+    return sql
+
+
+def initialize_database():
+    """
+    Register the parquet tables in DuckDB.
+    This can be rerun safely (views replaced).
+
+    Each table is a view over its parquet file, so nothing is copied:
+    queries scan the file directly, with projection and filter
+    pushdown into row groups, and always see its current contents.
+    Tables are registered concurrently, one cursor per table.
+
+    Registry rollups are then rebuilt from the fresh views.
+    """
+
+    print("[INFO] Initializing DuckDB warehouse...")
+
+    file_paths = {
+        table: os.path.join(DATA_PATH, file) for table, file in TABLES.items()
+    }
+
+    for file_path in file_paths.values():
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Missing parquet file: {file_path}")
+
+    con = get_connection()
+
+    # databases built before views held copied tables and load metadata
+    con.execute("DROP TABLE IF EXISTS _ingest_meta")
     con.close()
 
+    with ThreadPoolExecutor(max_workers=len(file_paths)) as executor:
+        # list() surfaces the first failed registration here
+        list(executor.map(register_table, file_paths, file_paths.values()))
+
+    # rollups read the views, so they are built after registration
+    for name, spec in get_schema().get("rollups", {}).items():
+        build_rollup(name, spec)
+
+    # fold the WAL into a database file once, after every table
+    if not IN_MEMORY:
+        con = get_connection()
+        con.execute("CHECKPOINT")
+        con.close()
+
+    clear_query_cache()
+
     print("[OK] DuckDB initialized successfully.")
 
 
+_views_ready = False
+_views_lock = threading.Lock()
+
+
+def ensure_database():
+    """
+    Register the views on first use when the database is in memory,
+    and rebuild any rollup whose source parquet has been rewritten.
+
+    A database file is initialized once, by running this module.
+    """
+
+    global _views_ready
+
+    if not IN_MEMORY:
+        return
+
+    if not _views_ready:
+        with _views_lock:
+            if not _views_ready:
+                initialize_database()
+                _views_ready = True
+
+    # views always read the current parquet; rollups are copies
+    if stale_rollups():
+        with _views_lock:
+            rollups = get_schema().get("rollups", {})
+            for name in stale_rollups():
+                build_rollup(name, rollups[name])
+            clear_query_cache()
+
+
 # -----------------------------
 # Query execution layer
 # -----------------------------
 
-def run_query(sql: str) -> pd.DataFrame:
+# Query result cache
+# -----------------------------
+# Agents re-ask the same aggregates many times per session. Arrow
+# results are immutable, so one cached table can be shared by every
+# caller; run_query_df builds a fresh DataFrame from it each time.
+# Entries expire after QUERY_CACHE_TTL seconds, so parquet rewrites
+# show up without a restart.
+
+QUERY_CACHE_SIZE = int(os.getenv("RIA_QUERY_CACHE_SIZE", "256"))
+QUERY_CACHE_TTL = float(os.getenv("RIA_QUERY_CACHE_TTL", "60"))
+
+# results of these depend on when the query runs, not just its text
+VOLATILE_SQL_RE = re.compile(
+    r"\b(now|random|uuid|current_(date|time|timestamp)|today)\b", re.IGNORECASE
+)
+
+_query_cache: "OrderedDict[Tuple[str, tuple], Tuple[float, pa.Table]]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+
+def _cache_get(key: Tuple[str, tuple]) -> Optional[pa.Table]:
+    with _query_cache_lock:
+        entry = _query_cache.get(key)
+        if entry is None:
+            return None
+
+        expires, table = entry
+        if expires < time.monotonic():
+            del _query_cache[key]
+            return None
+
+        _query_cache.move_to_end(key)
+        return table
+
+
+def _cache_put(key: Tuple[str, tuple], table: pa.Table):
+    if QUERY_CACHE_SIZE <= 0:
+        return
+
+    with _query_cache_lock:
+        _query_cache[key] = (time.monotonic() + QUERY_CACHE_TTL, table)
+        _query_cache.move_to_end(key)
+        if len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+
+
+def clear_query_cache():
+    with _query_cache_lock:
+        _query_cache.clear()
+
+
+# Query statistics
+# -----------------------------
+# Timing and row counts of recent run_query calls, to find the SQL
+# worth caching, pre-aggregating or narrowing. deque.append is
+# thread-safe, so recording takes no lock.
+
+QUERY_STATS_SIZE = 10_000
+
+_query_stats: "deque[Tuple[str, int, float, bool]]" = deque(maxlen=QUERY_STATS_SIZE)
+
+
+def _summarize_stats() -> List[Dict[str, Any]]:
+    """Per-SQL aggregates over the recorded calls."""
+    summary: Dict[str, Dict[str, Any]] = {}
+
+    for sql, n_rows, elapsed_ms, cache_hit in list(_query_stats):
+        entry = summary.setdefault(sql, {
+            "sql": sql, "calls": 0, "cache_hits": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "rows": 0
+        })
+        entry["calls"] += 1
+        entry["cache_hits"] += cache_hit
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["rows"] = n_rows
+
+    for entry in summary.values():
+        entry["mean_ms"] = entry["total_ms"] / entry["calls"]
+
+    return list(summary.values())
+
+
+def top_slow_queries(n: int = 10) -> List[Dict[str, Any]]:
+    """SQL with the highest mean latency among recent calls."""
+    return sorted(_summarize_stats(), key=lambda e: e["mean_ms"], reverse=True)[:n]
+
+
+def top_hot_queries(n: int = 10) -> List[Dict[str, Any]]:
+    """SQL called most often among recent calls."""
+    return sorted(_summarize_stats(), key=lambda e: e["calls"], reverse=True)[:n]
+
+
+def clear_query_stats():
+    _query_stats.clear()
+
+
+def _execute(sql: str, params: Sequence[Any]) -> pa.Table:
+    """Run on the backend; run_query has already set up the database."""
+
+    table = backend.execute_arrow(sql, params)
+
+    # dictionary-encode dimension columns: smaller results, and
+    # string checks downstream run over categories, not rows
+    for col in KNOWN_DIM_COLS.intersection(table.column_names):
+        index = table.schema.get_field_index(col)
+        table = table.set_column(
+            index, col, pc.dictionary_encode(table.column(index))
+        )
+
+    return table
+
+
+def _from_base_tables(ref: Optional[dict]) -> List[dict]:
+    """BASE_TABLE refs of a FROM clause, through joins, not subqueries."""
+    if not ref:
+        return []
+    if ref["type"] == "BASE_TABLE":
+        return [ref]
+    if ref["type"] == "JOIN":
+        return _from_base_tables(ref["left"]) + _from_base_tables(ref["right"])
+    return []
+
+
+def _full_stars(select_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Select entries that read every column: '*', COLUMNS(*), lambdas."""
+    found: List[Dict[str, Any]] = []
+
+    for entry in select_list:
+        if entry.get("class") != "STAR":
+            continue
+
+        # COLUMNS('rev.*') names the columns it reads through its regex
+        expr = entry.get("expr") or {}
+        if entry.get("columns") and expr.get("class") == "CONSTANT":
+            continue
+
+        found.append(entry)
+
+    return found
+
+
+def _star_tables(node: Any) -> List[str]:
+    """Base tables read by a star select anywhere in a parsed statement."""
+    found: List[str] = []
+
+    if isinstance(node, list):
+        for item in node:
+            found += _star_tables(item)
+        return found
+
+    if not isinstance(node, dict):
+        return found
+
+    if node.get("type") == "SELECT_NODE":
+        stars = _full_stars(node["select_list"])
+        tables = _from_base_tables(node.get("from_table"))
+
+        for star in stars:
+            # 't.*' only reads the relation it names
+            relation = star.get("relation_name", "").lower()
+            for ref in tables:
+                name = ref["table_name"].lower()
+                if name in TABLES and relation in ("", name, ref["alias"].lower()):
+                    found.append(name)
+
+    for value in node.values():
+        found += _star_tables(value)
+
+    return found
+
+
+@lru_cache(maxsize=256)
+def _star_tables_in(sql: str) -> Tuple[str, ...]:
+    """Parse with DuckDB's own parser; cached per SQL text."""
+
+    with read_pool.acquire() as con:
+        parsed = json.loads(
+            con.execute("SELECT json_serialize_sql(?)", [sql]).fetchone()[0]
+        )
+
+    # unparseable SQL is left for execution to report
+    if parsed.get("error"):
+        return ()
+
+    return tuple(sorted(set(_star_tables(parsed["statements"]))))
+
+
+def check_projection(sql: str):
+    """
+    Refuse a star select over a base table.
+
+    The tables are parquet views: naming columns lets the scan read
+    only those columns, while '*' decodes every column in the file.
+    Any star in a select list counts ('*, 1', 't.*', COLUMNS(*) or a
+    COLUMNS(lambda)), with or without schema or quoting on the table
+    name; COLUMNS('regex') is allowed, since the regex names the
+    columns. A star over a subquery or CTE is fine, since the inner
+    select is checked on its own.
+    """
+
+    tables = _star_tables_in(sql)
+    if tables:
+        raise ValueError(
+            f"SELECT * or COLUMNS(*) from {', '.join(tables)} is not "
+            "allowed; name the columns needed or match them with "
+            "COLUMNS('regex')"
+        )
+
+
+def run_query(sql: str, params: Sequence[Any] = ()) -> pa.Table:
+    """
+    Execute SQL safely against DuckDB and return an Arrow table.
+
+    Filter values are passed as bound parameters ('?' placeholders),
+    never interpolated into the SQL text, so a template sent with
+    different values is the same SQL string every time.
+
+    Results come straight from DuckDB's vectors, without boxing every
+    string cell into a Python object. Repeated queries are served from
+    the result cache for QUERY_CACHE_TTL seconds.
+
+    SQL that reads a registry rollup (aliased to its source) runs
+    against the source instead while the rollup is stale.
+
+    Each call's latency and row count are recorded for
+    top_slow_queries() / top_hot_queries().
+
+    Raises ValueError for SELECT * over a base table, and the
+    backend's QueryTimeout / QueryTooLarge for runaway queries.
+    """
+
+    check_projection(sql)
+
+    # first-use view setup is not part of any query's latency
+    ensure_database()
+    sql = resolve_rollups(sql)
+
+    start = time.perf_counter()
+    table, cache_hit = _cached_execute(sql, params)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    _query_stats.append((sql, table.num_rows, elapsed_ms, cache_hit))
+    return table
+
+
+def _cached_execute(sql: str, params: Sequence[Any]) -> Tuple[pa.Table, bool]:
+    """The query result and whether it came from the cache."""
+
+    if VOLATILE_SQL_RE.search(sql):
+        return _execute(sql, params), False
+
+    key = (sql, tuple(params))
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached, True
+
+    table = _execute(sql, params)
+    _cache_put(key, table)
+    return table, False
+
+
+def stream_query(
+    sql: str,
+    params: Sequence[Any] = (),
+    batch_rows: int = STREAM_BATCH_ROWS
+) -> Iterator[pa.RecordBatch]:
+    """
+    Execute SQL and yield the result as Arrow record batches.
+
+    Peak memory is one batch rather than the whole result, and the
+    first rows are available before the query has produced the last.
+    The pooled connection is held until the generator is exhausted
+    or closed.
+
+    Raises ValueError for SELECT * over a base table, before the
+    first batch is requested.
     """
-    Execute SQL safely against DuckDB.
+
+    check_projection(sql)
+    ensure_database()
+
+    return backend.stream(resolve_rollups(sql), params, batch_rows)
+
+
+def run_query_df(sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+    """
+    run_query() as a pandas DataFrame; dimension columns arrive as
+    categoricals.
+
+    Decimal columns (DuckDB's SUM over integers is HUGEINT, which Arrow
+    carries as decimal128) become float64, as fetch_df() returned them;
+    to_pandas() alone would give object columns of Decimal.
 
     This is the ONLY function agents should call.
     """
 
-    con = get_connection(read_only=True)
+    table = run_query(sql, params)
 
-    try:
-        df = con.execute(sql).fetch_df()
-        return df
-    finally:
-        con.close()
+    # a cast builds a new table; the cached one is left as it is
+    for index, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            table = table.set_column(
+                index, field.name, pc.cast(table.column(index), pa.float64())
+            )
+
+    return table.to_pandas()
 
 
 # -----------------------------
@@ -88,21 +620,26 @@ def run_query(sql: str) -> pd.DataFrame:
 # -----------------------------
 
 def health_check():
-    """Run sanity queries to confirm system readiness."""
-
-    con = get_connection(read_only=True)
+    """
+    Run sanity queries to confirm system readiness.
 
-    print("\n[HEALTH CHECK] Tables available:")
-    print(con.execute("SHOW TABLES").fetch_df())
+    The fact_sales checks share one scan that reads only the revenue
+    column.
+    """
 
-    print("\n[HEALTH CHECK] fact_sales sample:")
-    print(con.execute("SELECT * FROM fact_sales LIMIT 5").fetch_df())
+    con = get_connection(read_only=True)
 
-    print("\n[HEALTH CHECK] Revenue check:")
-    print(con.execute("SELECT SUM(revenue) AS total_revenue FROM fact_sales").fetch_df())
+    tables = [row[0] for row in con.execute("SHOW TABLES").fetchall()]
+    n_rows, total_revenue = con.execute(
+        "SELECT COUNT(*), SUM(revenue) FROM fact_sales"
+    ).fetchone()
 
     con.close()
 
+    print(f"\n[HEALTH CHECK] Tables available: {', '.join(tables)}")
+    print(f"[HEALTH CHECK] fact_sales rows: {n_rows}")
+    print(f"[HEALTH CHECK] Total revenue: {(total_revenue or 0):,.2f}")
+
 
 # -----------------------------
 # Entry point
@@ -0,0 +1,81 @@
+"""
+pool.py
+
+Purpose:
+--------
+Bounded, thread-safe pool of DuckDB connections.
+
+Connections are cursors on the shared database handle from
+connection.py, created on first use and reused across requests.
+DuckDB already parallelizes each query internally, so the pool is
+kept small: it bounds concurrent queries rather than adding cores.
+"""
+
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import duckdb
+
+from .connection import get_connection
+
+
+# -----------------------------
+# Configuration
+# -----------------------------
+
+# number of pooled read connections shared by all sessions
+POOL_SIZE = int(os.getenv("RIA_POOL_SIZE", "4"))
+
+
+# -----------------------------
+# Pool
+# -----------------------------
+
+class DuckDBPool:
+    """Fixed-size pool; acquire() blocks while every connection is in use."""
+
+    def __init__(self, size: int = POOL_SIZE, read_only: bool = True):
+        self.size = size
+        self.read_only = read_only
+        self._queue: "queue.Queue[duckdb.DuckDBPyConnection]" = queue.Queue(maxsize=size)
+        self._connections: List[duckdb.DuckDBPyConnection] = []
+        self._lock = threading.Lock()
+
+    def _fill(self):
+        """Open the connections on first use, not at import time."""
+        if self._connections:
+            return
+
+        with self._lock:
+            if not self._connections:
+                connections = [
+                    get_connection(read_only=self.read_only) for _ in range(self.size)
+                ]
+                for con in connections:
+                    self._queue.put(con)
+                self._connections = connections
+
+    @contextmanager
+    def acquire(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        self._fill()
+        con = self._queue.get()
+        try:
+            yield con
+        finally:
+            self._queue.put(con)
+
+    def close(self):
+        with self._lock:
+            for con in self._connections:
+                con.close()
+            self._connections = []
+            self._queue = queue.Queue(maxsize=self.size)
+
+
+read_pool = DuckDBPool(POOL_SIZE, read_only=True)
+
+atexit.register(read_pool.close)